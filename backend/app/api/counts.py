@@ -0,0 +1,95 @@
+import json
+import threading
+import time
+from typing import Any, Literal
+
+from sqlalchemy import Select
+from sqlmodel import Session, func, select
+
+from app.core.config import settings
+
+# exact: count(*) on every request
+# cached: count(*) at most once per COUNT_CACHE_TTL_SECONDS per listing
+# estimate: the planner's row estimate, from pg_class.reltuples and statistics
+CountMode = Literal["exact", "cached", "estimate"]
+
+
+class CountCache:
+    """
+    In-process TTL cache of listing totals keyed by their SQL and parameters
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: dict[tuple[str, str], tuple[float, int]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple[str, str]) -> int | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, count = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                return None
+            return count
+
+    def set(self, key: tuple[str, str], count: int) -> None:
+        now = time.time()
+        with self._lock:
+            if len(self._entries) >= self.max_entries:
+                self._entries = {k: v for k, v in self._entries.items() if v[0] > now}
+                if len(self._entries) >= self.max_entries:
+                    self._entries.clear()
+            self._entries[key] = (now + self.ttl_seconds, count)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+count_cache = CountCache(
+    settings.COUNT_CACHE_TTL_SECONDS, settings.COUNT_CACHE_MAX_ENTRIES
+)
+
+
+def _compile(session: Session, statement: Select[Any]) -> tuple[str, dict[str, Any]]:
+    compiled = statement.compile(session.get_bind())
+    return str(compiled), compiled.params
+
+
+def _exact_count(session: Session, statement: Select[Any]) -> int:
+    count_statement = select(func.count()).select_from(statement.subquery())
+    return session.exec(count_statement).one()
+
+
+def _estimated_count(session: Session, statement: Select[Any]) -> int:
+    sql, params = _compile(session, statement)
+    result = session.connection().exec_driver_sql(
+        f"EXPLAIN (FORMAT JSON) {sql}", params
+    )
+    [[plan]] = result.all()
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def count_rows(
+    session: Session, statement: Select[Any], mode: CountMode = "exact"
+) -> int:
+    """
+    Total number of rows a listing statement returns, before paging
+
+    :param statement: The listing without its ORDER BY, OFFSET and LIMIT
+    """
+    if mode == "estimate":
+        return _estimated_count(session, statement)
+    if mode == "cached":
+        sql, params = _compile(session, statement)
+        key = (sql, json.dumps(params, default=str, sort_keys=True))
+        count = count_cache.get(key)
+        if count is None:
+            count = _exact_count(session, statement)
+            count_cache.set(key, count)
+        return count
+    return _exact_count(session, statement)
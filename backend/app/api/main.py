@@ -9,6 +9,7 @@ from app.api.routes import (
     proxy_image,
     users,
     utils,
+    wines,
 )
 from app.core.config import settings
 
@@ -20,6 +21,7 @@ api_router.include_router(items.router)
 api_router.include_router(blogs.router)
 api_router.include_router(blog_posts.router)
 api_router.include_router(proxy_image.router)
+api_router.include_router(wines.router)
 
 if settings.ENVIRONMENT == "local":
     api_router.include_router(private.router)
@@ -0,0 +1,53 @@
+import base64
+import json
+import uuid
+from datetime import datetime
+from typing import Any
+
+from fastapi import HTTPException
+
+
+def _encode(values: list[Any]) -> str:
+    payload = json.dumps(values)
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def _decode(cursor: str) -> Any:
+    payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+    return json.loads(payload)
+
+
+def encode_cursor(published_at: datetime, id: uuid.UUID) -> str:
+    """
+    Opaque keyset cursor pointing after the row with this sort key
+    """
+    return _encode([published_at.isoformat(), str(id)])
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, uuid.UUID]:
+    """
+    :raises HTTPException: 400 when the cursor was not made by ``encode_cursor``
+    """
+    try:
+        published_at, id = _decode(cursor)
+        return datetime.fromisoformat(published_at), uuid.UUID(id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def encode_rank_cursor(rank: float, id: uuid.UUID) -> str:
+    """
+    Opaque keyset cursor for results ordered by relevance
+    """
+    return _encode([rank, str(id)])
+
+
+def decode_rank_cursor(cursor: str) -> tuple[float, uuid.UUID]:
+    """
+    :raises HTTPException: 400 when the cursor was not made by ``encode_rank_cursor``
+    """
+    try:
+        rank, id = _decode(cursor)
+        return float(rank), uuid.UUID(id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
@@ -1,14 +1,85 @@
 import uuid
-from typing import Any
+from typing import Annotated, Any, TypeVar
 
-from fastapi import APIRouter, HTTPException
-from sqlmodel import func, select
+from fastapi import APIRouter, HTTPException, Query
+from sqlalchemy import ColumnElement, Float, Select, tuple_
+from sqlalchemy.dialects.postgresql import REGCONFIG
+from sqlmodel import Session, cast, col, func, literal, or_, select, text
 
+from app import crud
+from app.api.counts import CountMode, count_rows
 from app.api.deps import SessionDep
-from app.models import Blog, BlogPost, BlogPostPublic, BlogPostsPublic
+from app.api.pagination import (
+    decode_cursor,
+    decode_rank_cursor,
+    encode_cursor,
+    encode_rank_cursor,
+)
+from app.models import (
+    Blog,
+    BlogPost,
+    BlogPostPublic,
+    BlogPostSearchHit,
+    BlogPostSearchResults,
+    BlogPostsPublic,
+    BlogPostSummariesPublic,
+    BlogPostSummary,
+)
 
 router = APIRouter(prefix="/blog/posts", tags=["blog_posts"])
 
+_Select = TypeVar("_Select", bound=Select[Any])
+
+# Checked once per process, see _has_trigram_search
+_trigram_search: bool | None = None
+
+
+def make_excerpt(text: str, length: int = crud.SUMMARY_EXCERPT_LENGTH) -> str:
+    """
+    Collapse whitespace and cut the text at a word boundary near ``length``
+    """
+    text = " ".join(text.split())
+    if len(text) <= length:
+        return text
+    cut = text[:length]
+    if " " in cut:
+        cut = cut.rsplit(" ", 1)[0]
+    return f"{cut}…"
+
+
+def _paginate(statement: _Select, skip: int, limit: int, cursor: str | None) -> _Select:
+    """
+    Order posts newest first and select one page, plus one row to tell
+    whether a next page exists
+
+    With a ``cursor`` the page starts right after the row it points to, which
+    the (published_at, id) indexes find without reading the skipped rows.
+    """
+    statement = statement.order_by(
+        col(BlogPost.published_at).desc(), col(BlogPost.id).desc()
+    )
+    if cursor:
+        published_at, id = decode_cursor(cursor)
+        statement = statement.where(
+            tuple_(col(BlogPost.published_at), col(BlogPost.id)) < (published_at, id)
+        )
+    else:
+        statement = statement.offset(skip)
+    return statement.limit(limit + 1)
+
+
+def _has_trigram_search(session: Session) -> bool:
+    """
+    Whether the pg_trgm extension and its title index are installed
+    """
+    global _trigram_search
+    if _trigram_search is None:
+        _trigram_search = (
+            session.scalar(text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'"))
+            is not None
+        )
+    return _trigram_search
+
 
 @router.get("/", response_model=BlogPostsPublic)
 def read_blog_posts(
@@ -16,55 +87,123 @@ def read_blog_posts(
     skip: int = 0,
     limit: int = 100,
     blog_id: uuid.UUID | None = None,
+    cursor: str | None = None,
+    count_mode: CountMode = "exact",
 ) -> Any:
     """
-    Retrieve all blog posts with optional blog filtering.
-    """
+    Retrieve all blog posts with optional blog filtering, newest first.
 
-    # Base query for blog posts
-    base_query = select(BlogPost)
+    Pass the returned ``next_cursor`` as ``cursor`` to get the next page,
+    ``skip`` is then ignored. With ``count_mode`` set to ``cached`` or
+    ``estimate`` the total is approximate but does not scan the table.
+    """
 
-    # Add blog filter if blog_id is provided
+    count_query = select(BlogPost.id)
+    statement = crud.select_blog_posts_public()
     if blog_id:
         blog = session.get(Blog, blog_id)
         if not blog:
             raise HTTPException(status_code=404, detail="Blog not found")
-        base_query = base_query.where(BlogPost.blog_id == blog_id)
-
-    # Count query
-    count_query = select(func.count()).select_from(base_query.subquery())
-    count = session.exec(count_query).one()
-
-    # Data query with pagination
-    statement = base_query.offset(skip).limit(limit)
-    blog_posts = session.exec(statement).all()
-
-    # Get all unique blog IDs to fetch blog names efficiently
-    blog_ids = list({post.blog_id for post in blog_posts})
-    blogs = {}
-    if blog_ids:
-        blogs_query = select(Blog).where(Blog.id.in_(blog_ids))
-        blogs_list = session.exec(blogs_query).all()
-        blogs = {blog.id: blog for blog in blogs_list}
-
-    # Convert to BlogPostPublic with blog_name
-    blog_posts_public = [
-        BlogPostPublic(
-            id=blog_post.id,
-            blog_name=blogs.get(blog_post.blog_id, {}).name
-            if blogs.get(blog_post.blog_id)
-            else "Unknown Blog",
-            url=blog_post.url,
-            post_id=blog_post.post_id,
-            title=blog_post.title,
-            published_at=blog_post.published_at,
-            content=blog_post.content,
-            image_urls=blog_post.image_urls,
+        count_query = count_query.where(BlogPost.blog_id == blog_id)
+        statement = statement.where(col(BlogPost.blog_id) == blog_id)
+    count = count_rows(session, count_query, count_mode)
+
+    blog_posts = crud.get_blog_posts_public(
+        session=session, statement=_paginate(statement, skip, limit, cursor)
+    )
+    next_cursor = None
+    if len(blog_posts) > limit:
+        blog_posts = blog_posts[:limit]
+        next_cursor = encode_cursor(blog_posts[-1].published_at, blog_posts[-1].id)
+
+    return BlogPostsPublic(data=blog_posts, count=count, next_cursor=next_cursor)
+
+
+@router.get("/summary", response_model=BlogPostSummariesPublic)
+def read_blog_post_summaries(
+    session: SessionDep,
+    skip: int = 0,
+    limit: int = 100,
+    blog_id: uuid.UUID | None = None,
+    cursor: str | None = None,
+    count_mode: CountMode = "exact",
+) -> Any:
+    """
+    Retrieve the latest blog posts without their content, for listings.
+
+    Only an excerpt of the content and the first images are read, so a page
+    costs a fraction of ``read_blog_posts``. Paging and counting work the same.
+    """
+    if blog_id and not session.get(Blog, blog_id):
+        raise HTTPException(status_code=404, detail="Blog not found")
+
+    count_query = select(BlogPost.id)
+    if blog_id:
+        count_query = count_query.where(BlogPost.blog_id == blog_id)
+    count = count_rows(session, count_query, count_mode)
+
+    statement = crud.select_blog_post_summaries()
+    if blog_id:
+        statement = statement.where(col(BlogPost.blog_id) == blog_id)
+    rows = session.exec(_paginate(statement, skip, limit, cursor)).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].published_at, rows[-1].id)
+
+    summaries = [
+        BlogPostSummary.model_validate(
+            {**row._asdict(), "excerpt": make_excerpt(row.excerpt)}
         )
-        for blog_post in blog_posts
+        for row in rows
     ]
+    return BlogPostSummariesPublic(data=summaries, count=count, next_cursor=next_cursor)
+
+
+@router.get("/search", response_model=BlogPostSearchResults)
+def search_blog_posts(
+    session: SessionDep,
+    q: Annotated[str, Query(min_length=1, max_length=200)],
+    limit: int = 20,
+    cursor: str | None = None,
+) -> Any:
+    """
+    Search blog posts by title and content, most relevant first.
 
-    return BlogPostsPublic(data=blog_posts_public, count=count)
+    Words are matched with full-text search, title matches ranking higher.
+    With pg_trgm installed, titles that only resemble the query match too, so
+    misspelled or differently spaced wine names are found. Page with
+    ``next_cursor`` like the listings.
+    """
+    query = func.websearch_to_tsquery(cast("simple", REGCONFIG), q)
+    matches: ColumnElement[Any] = col(BlogPost.search_vector).op("@@")(query)
+    score: ColumnElement[Any] = func.ts_rank_cd(col(BlogPost.search_vector), query)
+    if _has_trigram_search(session):
+        matches = or_(matches, literal(q).op("<%")(col(BlogPost.title)))
+        score = score + func.word_similarity(q, col(BlogPost.title))
+    # Double precision, so the rank in a cursor compares exactly
+    rank = cast(score, Float)
+
+    statement = crud.select_blog_post_summaries(rank.label("rank")).where(matches)
+    if cursor:
+        cursor_rank, cursor_id = decode_rank_cursor(cursor)
+        statement = statement.where(
+            tuple_(rank, col(BlogPost.id)) < (cursor_rank, cursor_id)
+        )
+    statement = statement.order_by(rank.desc(), col(BlogPost.id).desc())
+    rows = session.exec(statement.limit(limit + 1)).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_rank_cursor(rows[-1].rank, rows[-1].id)
+
+    hits = [
+        BlogPostSearchHit.model_validate(
+            {**row._asdict(), "excerpt": make_excerpt(row.excerpt)}
+        )
+        for row in rows
+    ]
+    return BlogPostSearchResults(data=hits, next_cursor=next_cursor)
 
 
 @router.get("/post/{id}", response_model=BlogPostPublic)
@@ -72,20 +211,7 @@ def read_blog_post(session: SessionDep, id: uuid.UUID) -> Any:
     """
     Get blog post by ID.
     """
-    blog_post = session.get(BlogPost, id)
+    blog_post = crud.get_blog_post_public(session=session, id=id)
     if not blog_post:
         raise HTTPException(status_code=404, detail="Blog post not found")
-
-    # Get the associated blog
-    blog = session.get(Blog, blog_post.blog_id)
-
-    return BlogPostPublic(
-        id=blog_post.id,
-        blog_name=blog.name if blog else "Unknown Blog",
-        url=blog_post.url,
-        post_id=blog_post.post_id,
-        title=blog_post.title,
-        published_at=blog_post.published_at,
-        content=blog_post.content,
-        image_urls=blog_post.image_urls,
-    )
+    return blog_post
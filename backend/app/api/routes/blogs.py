@@ -2,8 +2,9 @@ import uuid
 from typing import Any
 
 from fastapi import APIRouter, HTTPException
-from sqlmodel import func, select
+from sqlmodel import select
 
+from app.api.counts import CountMode, count_rows
 from app.api.deps import CurrentUser, SessionDep
 from app.models import Blog, BlogCreate, BlogPublic, BlogsPublic, BlogUpdate, Message
 
@@ -12,24 +13,23 @@ router = APIRouter(prefix="/blogs", tags=["blogs"])
 
 @router.get("/", response_model=BlogsPublic)
 def read_blogs(
-    session: SessionDep, current_user: CurrentUser, skip: int = 0, limit: int = 100
+    session: SessionDep,
+    current_user: CurrentUser,
+    skip: int = 0,
+    limit: int = 100,
+    count_mode: CountMode = "exact",
 ) -> Any:
     """
     Retrieve blogs.
     """
 
     if current_user.is_superuser:
-        count_statement = select(func.count()).select_from(Blog)
-        count = session.exec(count_statement).one()
+        count = count_rows(session, select(Blog.id), count_mode)
         statement = select(Blog).offset(skip).limit(limit)
         blogs = session.exec(statement).all()
     else:
-        count_statement = (
-            select(func.count())
-            .select_from(Blog)
-            .where(Blog.owner_id == current_user.id)
-        )
-        count = session.exec(count_statement).one()
+        count_statement = select(Blog.id).where(Blog.owner_id == current_user.id)
+        count = count_rows(session, count_statement, count_mode)
         statement = (
             select(Blog)
             .where(Blog.owner_id == current_user.id)
@@ -2,8 +2,9 @@ import uuid
 from typing import Any
 
 from fastapi import APIRouter, HTTPException
-from sqlmodel import func, select
+from sqlmodel import select
 
+from app.api.counts import CountMode, count_rows
 from app.api.deps import CurrentUser, SessionDep
 from app.models import Item, ItemCreate, ItemPublic, ItemsPublic, ItemUpdate, Message
 
@@ -12,24 +13,23 @@ router = APIRouter(prefix="/items", tags=["items"])
 
 @router.get("/", response_model=ItemsPublic)
 def read_items(
-    session: SessionDep, current_user: CurrentUser, skip: int = 0, limit: int = 100
+    session: SessionDep,
+    current_user: CurrentUser,
+    skip: int = 0,
+    limit: int = 100,
+    count_mode: CountMode = "exact",
 ) -> Any:
     """
     Retrieve items.
     """
 
     if current_user.is_superuser:
-        count_statement = select(func.count()).select_from(Item)
-        count = session.exec(count_statement).one()
+        count = count_rows(session, select(Item.id), count_mode)
         statement = select(Item).offset(skip).limit(limit)
         items = session.exec(statement).all()
     else:
-        count_statement = (
-            select(func.count())
-            .select_from(Item)
-            .where(Item.owner_id == current_user.id)
-        )
-        count = session.exec(count_statement).one()
+        count_statement = select(Item.id).where(Item.owner_id == current_user.id)
+        count = count_rows(session, count_statement, count_mode)
         statement = (
             select(Item)
             .where(Item.owner_id == current_user.id)
@@ -1,36 +1,265 @@
-import io
+import asyncio
+from collections.abc import AsyncIterator
+from pathlib import Path
+from typing import Annotated
 from urllib.parse import unquote
 
-import requests
-from fastapi import APIRouter
-from fastapi.responses import StreamingResponse
+import anyio
+import httpx
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import FileResponse, Response, StreamingResponse
+from starlette.background import BackgroundTask
+
+from app.api.deps import get_current_active_superuser
+from app.core.config import settings
+from app.services.image_cache import (
+    CachedImage,
+    CacheStats,
+    ImageCache,
+    MemoryImage,
+    memory_image_cache,
+)
+from app.services.image_proxy import (
+    IMAGE_CHUNK_SIZE,
+    StoredImage,
+    UpstreamImage,
+    get_original,
+    get_variant,
+    is_immutable,
+    promote,
+)
+from app.services.thumbnails import ThumbnailFormat, snap_size
 
 router = APIRouter(prefix="/proxy", tags=["proxy"])
 
+# Upstream headers passed on to the client as they are
+FORWARDED_HEADERS = (
+    "Content-Length",
+    "Content-Encoding",
+    "Content-Range",
+    "Accept-Ranges",
+    "Last-Modified",
+    "ETag",
+)
+
+CORS_HEADERS = {
+    "Access-Control-Allow-Origin": "*",
+    "Access-Control-Allow-Methods": "GET",
+    "Access-Control-Allow-Headers": "*",
+}
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """
+    Weak comparison of an If-None-Match header against a bare ETag value
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+    return f'"{etag}"' in candidates
+
+
+def _parse_range(byte_range: str, size: int) -> tuple[int, int] | None:
+    """
+    Parse a single ``bytes=`` range into inclusive offsets
+
+    Malformed headers and multiple ranges are ignored, the full body is
+    served then.
+
+    :raises HTTPException: 416 when the range starts past the end
+    """
+    unit, _, spec = byte_range.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    first, _, last = spec.strip().partition("-")
+    try:
+        if first:
+            start = int(first)
+            if not last:
+                end = size - 1
+            elif (end := int(last)) < start:
+                return None
+        elif last:
+            # Suffix range, the last N bytes
+            start, end = max(size - int(last), 0), size - 1
+        else:
+            return None
+    except ValueError:
+        return None
+    end = min(end, size - 1)
+    if start >= size or end < start:
+        raise HTTPException(
+            status_code=416,
+            detail="Range not satisfiable",
+            headers={**CORS_HEADERS, "Content-Range": f"bytes */{size}"},
+        )
+    return start, end
+
+
+def _if_range_matches(if_range: str | None, image: StoredImage) -> bool:
+    """
+    Whether a Range may be served, If-Range names the ETag or Last-Modified of
+    the copy the client already holds
+    """
+    if not if_range:
+        return True
+    if_range = if_range.strip()
+    return if_range in (f'"{image.etag}"', image.last_modified)
+
+
+async def _read_file_range(path: Path, start: int, end: int) -> AsyncIterator[bytes]:
+    async with await anyio.open_file(path, "rb") as file:
+        await file.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = await file.read(min(IMAGE_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+def _image_headers(image: StoredImage, immutable: bool) -> dict[str, str]:
+    headers = {
+        **CORS_HEADERS,
+        "Accept-Ranges": "bytes",
+        "ETag": f'"{image.etag}"',
+        "Cache-Control": IMMUTABLE_CACHE_CONTROL
+        if immutable
+        else f"public, max-age={settings.IMAGE_CACHE_REVALIDATE_SECONDS}",
+    }
+    if image.last_modified:
+        headers["Last-Modified"] = image.last_modified
+    return headers
+
+
+def _upstream_error(e: httpx.HTTPError) -> HTTPException:
+    if isinstance(e, httpx.HTTPStatusError) and e.response.status_code == 416:
+        content_range = e.response.headers.get("content-range")
+        headers = {"Content-Range": content_range} if content_range else None
+        return HTTPException(
+            status_code=416, detail="Range not satisfiable", headers=headers
+        )
+    if isinstance(e, httpx.HTTPStatusError):
+        detail = f"Image host responded with {e.response.status_code}"
+    else:
+        detail = "Cannot reach the image host"
+    return HTTPException(status_code=502, detail=detail)
+
+
+def _stream_upstream(upstream: UpstreamImage) -> StreamingResponse:
+    """
+    Pass an upstream image through without caching it
+
+    The Range header was forwarded, so large files can be resumed or seeked.
+    Without an upstream Content-Length the body is sent chunked.
+    """
+    response = upstream.response
+    headers = {
+        name: response.headers[name]
+        for name in FORWARDED_HEADERS
+        if name in response.headers
+    }
+    if upstream.decoded:
+        headers.pop("Content-Encoding", None)
+        headers.pop("Content-Length", None)
+    return StreamingResponse(
+        upstream.body,
+        status_code=response.status_code,
+        media_type=response.headers.get("content-type", "image/jpeg"),
+        headers={**headers, **CORS_HEADERS},
+        background=BackgroundTask(upstream.aclose),
+    )
+
 
 @router.get("/image")
-def proxy_image(url: str):
+async def proxy_image(
+    url: str,
+    w: Annotated[int | None, Query(ge=1, le=4096)] = None,
+    h: Annotated[int | None, Query(ge=1, le=4096)] = None,
+    image_format: Annotated[ThumbnailFormat | None, Query(alias="format")] = None,
+    if_none_match: Annotated[str | None, Header()] = None,
+    byte_range: Annotated[str | None, Header(alias="range")] = None,
+    if_range: Annotated[str | None, Header()] = None,
+) -> Response:
     """
     Proxy image from external sources to bypass CORS restrictions
+
+    ``w``/``h`` resize the image, rounded up to a fixed size bucket, and
+    ``format`` recompresses it. Resizing defaults to WebP.
+
+    A single byte range is honoured with a 206. Files too large for the cache
+    are passed through with the range forwarded upstream.
     """
     # Decode the URL to handle Korean characters
     decoded_url = unquote(url)
 
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
-        "Referer": "https://blog.naver.com/",
-    }
+    key = ImageCache.key(decoded_url)
+    image: StoredImage | UpstreamImage
+    try:
+        if w or h or image_format:
+            key, image = await get_variant(
+                decoded_url,
+                key,
+                snap_size(w),
+                snap_size(h),
+                image_format or "webp",
+                byte_range,
+            )
+        else:
+            image = await get_original(decoded_url, key, byte_range)
+    except httpx.HTTPError as e:
+        raise _upstream_error(e)
+    if isinstance(image, UpstreamImage):
+        return _stream_upstream(image)
+
+    headers = _image_headers(image, is_immutable(decoded_url))
+    if _etag_matches(if_none_match, image.etag):
+        return Response(status_code=304, headers=headers)
+
+    if isinstance(image, CachedImage) and memory_image_cache.accepts(image.size):
+        image = await asyncio.to_thread(promote, key, image)
+    size = len(image.body) if isinstance(image, MemoryImage) else image.size
+    requested = (
+        _parse_range(byte_range, size)
+        if byte_range and _if_range_matches(if_range, image)
+        else None
+    )
 
-    response = requests.get(decoded_url, headers=headers, timeout=10)
-    response.raise_for_status()
+    if requested is None:
+        if isinstance(image, MemoryImage):
+            return Response(image.body, media_type=image.content_type, headers=headers)
+        # FileResponse hands the file to the server, which can sendfile it
+        return FileResponse(image.path, media_type=image.content_type, headers=headers)
 
+    start, end = requested
+    headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    headers["Content-Length"] = str(end - start + 1)
+    if isinstance(image, MemoryImage):
+        return Response(
+            image.body[start : end + 1],
+            status_code=206,
+            media_type=image.content_type,
+            headers=headers,
+        )
     return StreamingResponse(
-        io.BytesIO(response.content),
-        media_type=response.headers.get("content-type", "image/jpeg"),
-        headers={
-            "Content-Length": str(len(response.content)),
-            "Access-Control-Allow-Origin": "*",
-            "Access-Control-Allow-Methods": "GET",
-            "Access-Control-Allow-Headers": "*",
-        },
+        _read_file_range(image.path, start, end),
+        status_code=206,
+        media_type=image.content_type,
+        headers=headers,
     )
+
+
+@router.get(
+    "/image/cache-stats",
+    dependencies=[Depends(get_current_active_superuser)],
+)
+def image_cache_stats() -> CacheStats:
+    """
+    Hit, miss and eviction counters of the in-memory image tier
+    """
+    return memory_image_cache.stats()
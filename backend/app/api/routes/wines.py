@@ -0,0 +1,65 @@
+from datetime import datetime
+from typing import Any
+
+from fastapi import APIRouter, HTTPException
+from sqlmodel import col, func, select
+
+from app.api.deps import SessionDep
+from app.models import (
+    Blog,
+    BlogPost,
+    WineMention,
+    WineMentionPublic,
+    WineMentionsPublic,
+)
+from app.services.wine_extractor import get_wine_extractor
+
+router = APIRouter(prefix="/wines", tags=["wines"])
+
+
+@router.get("/mentions", response_model=WineMentionsPublic)
+def read_wine_mentions(
+    session: SessionDep,
+    wine: str,
+    since: datetime | None = None,
+    limit: int = 100,
+) -> Any:
+    """
+    Retrieve the latest posts mentioning a wine, with the vintage and price
+    quoted for it.
+
+    Any alias in the wine dictionary is accepted for ``wine``.
+    """
+    name = get_wine_extractor().canonical_name(wine)
+    if name is None:
+        raise HTTPException(status_code=404, detail="Wine not found")
+
+    conditions = [col(WineMention.wine) == name]
+    if since:
+        conditions.append(col(WineMention.published_at) >= since)
+
+    count_query = select(func.count()).select_from(WineMention).where(*conditions)
+    count = session.exec(count_query).one()
+
+    statement = (
+        select(  # type: ignore[call-overload]
+            col(WineMention.wine),
+            col(WineMention.vintage),
+            col(WineMention.price),
+            col(WineMention.blog_post_id),
+            col(WineMention.published_at),
+            col(Blog.name).label("blog_name"),
+            col(BlogPost.title),
+            col(BlogPost.url),
+        )
+        .join(BlogPost, col(BlogPost.id) == WineMention.blog_post_id)
+        .join(Blog, col(Blog.id) == BlogPost.blog_id)
+        .where(*conditions)
+        .order_by(col(WineMention.published_at).desc())
+        .limit(limit)
+    )
+    mentions = [
+        WineMentionPublic.model_validate(row._asdict())
+        for row in session.exec(statement).all()
+    ]
+    return WineMentionsPublic(wine=name, data=mentions, count=count)
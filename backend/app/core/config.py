@@ -1,5 +1,7 @@
 import secrets
+import tempfile
 import warnings
+from pathlib import Path
 from typing import Annotated, Any, Literal
 
 from pydantic import (
@@ -91,6 +93,58 @@ class Settings(BaseSettings):
     def emails_enabled(self) -> bool:
         return bool(self.SMTP_HOST and self.EMAILS_FROM_EMAIL)
 
+    # Shared outbound HTTP client (Naver crawling)
+    HTTP_MAX_CONNECTIONS: int = 100
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTP_KEEPALIVE_EXPIRY: float = 30.0
+    HTTP_TIMEOUT: float = 10.0
+    # Token bucket per upstream host: sustained requests/second and burst size
+    HTTP_HOST_RATE_LIMIT: float = 10.0
+    HTTP_HOST_RATE_BURST: int = 20
+    # Retries on timeouts, 429 and 5xx with full-jitter exponential backoff
+    HTTP_RETRY_ATTEMPTS: int = 5
+    HTTP_RETRY_BACKOFF: float = 1.0
+    HTTP_RETRY_BACKOFF_MAX: float = 30.0
+    NAVER_FETCH_CONCURRENCY: int = 8
+    NAVER_CATEGORY_CACHE_TTL_SECONDS: int = 60 * 60 * 24
+    NAVER_HTML_PARSER: Literal["lxml", "html.parser"] = "lxml"
+    # Parse stage process pool, None means one process per CPU
+    NAVER_PARSE_WORKERS: int | None = None
+    NAVER_PARSE_QUEUE_SIZE: int = 32
+
+    # Disk cache of images served by /proxy/image
+    IMAGE_CACHE_DIR: Path = Path(tempfile.gettempdir()) / "wine-blog-catcher-images"
+    IMAGE_CACHE_MAX_BYTES: int = 1024 * 1024 * 1024
+    # Every worker shares the directory, each sweeps it for eviction this often
+    IMAGE_CACHE_SWEEP_SECONDS: int = 60
+    # Larger files (videos, long GIFs) are passed through with Range support
+    IMAGE_CACHE_MAX_ITEM_BYTES: int = 32 * 1024 * 1024
+    # Images outside the Naver CDN are revalidated upstream after this long
+    IMAGE_CACHE_REVALIDATE_SECONDS: int = 60 * 60 * 24
+    # Hot tier of small images kept in memory in front of the disk cache
+    IMAGE_MEMORY_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    IMAGE_MEMORY_CACHE_MAX_ITEM_BYTES: int = 256 * 1024
+    # Process pool rendering resized variants of proxied images
+    IMAGE_RESIZE_WORKERS: int = 2
+    # Warm the image cache with the images of newly crawled posts
+    IMAGE_PREFETCH_ENABLED: bool = False
+    IMAGE_PREFETCH_CONCURRENCY: int = 4
+    # Images waiting for a prefetch worker, more are left to their first view
+    IMAGE_PREFETCH_QUEUE_SIZE: int = 10_000
+
+    # Background crawl of every Blog, driven by a single worker
+    CRAWL_SCHEDULER_ENABLED: bool = False
+    CRAWL_INTERVAL_MINUTES: int = 60
+    CRAWL_JITTER_SECONDS: int = 300
+    CRAWL_MAX_CONCURRENCY: int = 4
+
+    # Wines recognised in crawled posts, a CSV of name and |-separated aliases
+    WINE_DICTIONARY_PATH: Path = Path(__file__).parents[1] / "data" / "wines.csv"
+
+    # Listing totals requested with count_mode=cached are reused for this long
+    COUNT_CACHE_TTL_SECONDS: int = 60
+    COUNT_CACHE_MAX_ENTRIES: int = 1024
+
     EMAIL_TEST_USER: EmailStr = "test@example.com"
     FIRST_SUPERUSER: EmailStr
     FIRST_SUPERUSER_PASSWORD: str
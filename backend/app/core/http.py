@@ -0,0 +1,208 @@
+import asyncio
+import logging
+import threading
+import time
+import weakref
+from collections.abc import Coroutine
+from typing import Any, TypeVar
+
+import httpx
+from tenacity import (
+    AsyncRetrying,
+    before_sleep_log,
+    retry_if_exception,
+    stop_after_attempt,
+    wait_random_exponential,
+)
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
+}
+
+# httpx connections are bound to the event loop that opened them, so keep one
+# pooled client per loop instead of a single module-level instance.
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+    weakref.WeakKeyDictionary()
+)
+
+RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+_background_loop: asyncio.AbstractEventLoop | None = None
+_background_loop_lock = threading.Lock()
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """
+    Return the keep-alive client shared by everything running on the current event loop
+    """
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            headers=DEFAULT_HEADERS,
+            follow_redirects=True,
+            timeout=settings.HTTP_TIMEOUT,
+            limits=httpx.Limits(
+                max_connections=settings.HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY,
+            ),
+        )
+        _clients[loop] = client
+    return client
+
+
+async def close_async_client() -> None:
+    """
+    Close the shared client of the current event loop, if one was opened
+    """
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+class TokenBucket:
+    """
+    Token bucket rate limiter
+
+    State is guarded by a thread lock and waiting is a plain ``asyncio.sleep``,
+    so one bucket paces callers on every event loop of the process.
+    """
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        """
+        :param rate: Tokens added per second
+        :param capacity: Largest number of tokens, i.e. the burst size
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self._updated_at
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+        self._updated_at = now
+
+    def reserve(self) -> float:
+        """
+        Take a token and return the seconds to wait before using it
+        """
+        with self._lock:
+            self._refill()
+            self._tokens -= 1
+            return max(0.0, -self._tokens / self.rate)
+
+    async def acquire(self) -> None:
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def pause(self, seconds: float) -> None:
+        """
+        Hold back every caller for at least ``seconds``, e.g. after a 429
+        """
+        with self._lock:
+            self._refill()
+            self._tokens = min(self._tokens, -seconds * self.rate)
+
+
+_rate_limiters: dict[str, TokenBucket] = {}
+_rate_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(host: str) -> TokenBucket:
+    """
+    Return the token bucket shared by every request to ``host``
+    """
+    with _rate_limiters_lock:
+        bucket = _rate_limiters.get(host)
+        if bucket is None:
+            bucket = TokenBucket(
+                settings.HTTP_HOST_RATE_LIMIT, settings.HTTP_HOST_RATE_BURST
+            )
+            _rate_limiters[host] = bucket
+        return bucket
+
+
+def is_retryable(exception: BaseException) -> bool:
+    """
+    Whether a request failed for a reason that may pass, a timeout, a lost
+    connection, throttling or an outage
+    """
+    if isinstance(exception, httpx.HTTPStatusError):
+        return exception.response.status_code in RETRY_STATUS_CODES
+    return isinstance(exception, httpx.TransportError)
+
+
+def _retry_after(response: httpx.Response) -> float | None:
+    try:
+        return float(response.headers["Retry-After"])
+    except (KeyError, ValueError):
+        return None
+
+
+async def request_with_retry(
+    client: httpx.AsyncClient, method: str, url: str, **kwargs: Any
+) -> httpx.Response:
+    """
+    Send a rate-limited request, retrying timeouts, 429 and 5xx responses
+
+    Every attempt waits for a token of the host's bucket. A 429 pauses the
+    whole bucket for its Retry-After, so concurrent requests to the throttled
+    host back off together instead of piling on more 429s.
+
+    :raises httpx.HTTPStatusError: For non-retryable error responses and once
+        retries are exhausted
+    :raises httpx.TransportError: When the last attempt failed to connect or timed out
+    """
+    bucket = get_rate_limiter(httpx.URL(url).host)
+    retrying = AsyncRetrying(
+        retry=retry_if_exception(is_retryable),
+        stop=stop_after_attempt(settings.HTTP_RETRY_ATTEMPTS),
+        wait=wait_random_exponential(
+            multiplier=settings.HTTP_RETRY_BACKOFF,
+            max=settings.HTTP_RETRY_BACKOFF_MAX,
+        ),
+        before_sleep=before_sleep_log(logger, logging.WARNING),
+        reraise=True,
+    )
+    async for attempt in retrying:
+        with attempt:
+            await bucket.acquire()
+            response = await client.request(method, url, **kwargs)
+            if response.status_code == 429:
+                bucket.pause(_retry_after(response) or settings.HTTP_RETRY_BACKOFF)
+            response.raise_for_status()
+    return response
+
+
+def _get_background_loop() -> asyncio.AbstractEventLoop:
+    global _background_loop
+    with _background_loop_lock:
+        if _background_loop is None:
+            _background_loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=_background_loop.run_forever,
+                name="http-client-loop",
+                daemon=True,
+            ).start()
+    return _background_loop
+
+
+def run_sync(coro: Coroutine[Any, Any, T]) -> T:
+    """
+    Run a coroutine from synchronous code and wait for its result.
+
+    All synchronous callers share one background event loop, so they also share
+    its pooled client and keep-alive connections.
+    """
+    return asyncio.run_coroutine_threadsafe(coro, _get_background_loop()).result()
@@ -1,10 +1,34 @@
+import logging
 import uuid
+from collections.abc import Iterable
+from datetime import datetime
 from typing import Any
 
-from sqlmodel import Session, select
+from pydantic import ValidationError
+from sqlalchemy.dialects.postgresql import JSONB, JSONPATH, insert
+from sqlmodel import Session, cast, col, delete, func, literal, select
 
 from app.core.security import get_password_hash, verify_password
-from app.models import Item, User, ItemCreate, UserCreate, UserUpdate
+from app.models import (
+    Blog,
+    BlogPost,
+    BlogPostPublic,
+    Item,
+    ItemCreate,
+    NaverBlogPost,
+    User,
+    UserCreate,
+    UserUpdate,
+    WineMention,
+    WineMentionBase,
+)
+
+logger = logging.getLogger(__name__)
+
+# Characters of content shown under the title in post listings
+SUMMARY_EXCERPT_LENGTH = 200
+# Images shown per post in listings, one row of the latest posts grid
+SUMMARY_IMAGE_COUNT = 6
 
 
 def create_user(*, session: Session, user_create: UserCreate) -> User:
@@ -52,3 +76,193 @@ def create_item(*, session: Session, item_in: ItemCreate, owner_id: uuid.UUID) -
     session.commit()
     session.refresh(db_item)
     return db_item
+
+
+def get_blog_post_ids(*, session: Session, blog_id: uuid.UUID) -> set[str]:
+    statement = select(BlogPost.post_id).where(BlogPost.blog_id == blog_id)
+    return set(session.exec(statement).all())
+
+
+def _select_blog_posts(*columns: Any) -> Any:
+    """
+    Select the columns every post representation shares, with the name of
+    their blog joined in rather than loaded per post, plus ``columns``
+    """
+    # SQLModel's select is only typed up to four columns
+    return select(  # type: ignore[call-overload]
+        col(BlogPost.id),
+        col(Blog.name).label("blog_name"),
+        col(BlogPost.url),
+        col(BlogPost.post_id),
+        col(BlogPost.title),
+        col(BlogPost.published_at),
+        *columns,
+    ).join(Blog, col(Blog.id) == BlogPost.blog_id)
+
+
+def select_blog_posts_public() -> Any:
+    """
+    Select the ``BlogPostPublic`` columns of posts
+    """
+    return _select_blog_posts(col(BlogPost.content), col(BlogPost.image_urls))
+
+
+def select_blog_post_summaries(*columns: Any) -> Any:
+    """
+    Select the ``BlogPostSummary`` columns of posts, plus ``columns``
+
+    The excerpt is not cut at a word boundary yet, see ``make_excerpt``.
+    """
+    # Twice the excerpt length leaves room for the whitespace make_excerpt collapses
+    excerpt = func.left(BlogPost.content, SUMMARY_EXCERPT_LENGTH * 2)
+    image_urls = func.jsonb_path_query_array(
+        cast(BlogPost.image_urls, JSONB),
+        literal(f"$[0 to {SUMMARY_IMAGE_COUNT - 1}]", JSONPATH),
+        type_=JSONB,
+    )
+    return _select_blog_posts(
+        excerpt.label("excerpt"),
+        image_urls.label("image_urls"),
+        func.json_array_length(BlogPost.image_urls).label("image_count"),
+        *columns,
+    )
+
+
+def get_blog_posts_public(*, session: Session, statement: Any) -> list[BlogPostPublic]:
+    """
+    Run a statement built on ``select_blog_posts_public``, without loading
+    ORM instances
+    """
+    return [
+        BlogPostPublic.model_validate(row._asdict())
+        for row in session.exec(statement).all()
+    ]
+
+
+def get_blog_post_public(*, session: Session, id: uuid.UUID) -> BlogPostPublic | None:
+    statement = select_blog_posts_public().where(col(BlogPost.id) == id)
+    posts = get_blog_posts_public(session=session, statement=statement)
+    return posts[0] if posts else None
+
+
+def upsert_blog_posts(
+    *, session: Session, blog: Blog, posts: dict[str, NaverBlogPost]
+) -> tuple[int, list[str]]:
+    """
+    Insert or refresh posts of a blog with a single INSERT ... ON CONFLICT
+
+    Posts are validated one by one, an invalid post is left out instead of
+    failing the others.
+
+    :return: Number of posts stored and ids of the invalid posts
+    """
+    rows = []
+    invalid = []
+    for post_id, post in posts.items():
+        try:
+            db_post = BlogPost.model_validate(
+                post,
+                update={
+                    "blog_id": blog.id,
+                    "url": f"{blog.url}/{post_id}",
+                    "post_id": post_id,
+                },
+            )
+        except ValidationError as e:
+            logger.warning("Invalid post %s: %s", post_id, e)
+            invalid.append(post_id)
+            continue
+        rows.append(db_post.model_dump(exclude={"search_vector"}))
+    if not rows:
+        return 0, invalid
+    statement = insert(BlogPost).values(rows)
+    statement = statement.on_conflict_do_update(
+        constraint="uq_blogpost_blog_id_post_id",
+        set_={
+            "url": statement.excluded.url,
+            "title": statement.excluded.title,
+            "published_at": statement.excluded.published_at,
+            "content": statement.excluded.content,
+            "image_urls": statement.excluded.image_urls,
+            "updated_at": statement.excluded.updated_at,
+        },
+    )
+    session.execute(statement)
+    session.commit()
+    return len(rows), invalid
+
+
+def replace_wine_mentions(
+    *, session: Session, blog: Blog, mentions: dict[str, list[WineMentionBase]]
+) -> int:
+    """
+    Swap the wine mentions of the given posts of a blog for freshly extracted ones
+    """
+    if not mentions:
+        return 0
+    statement = select(BlogPost.id, BlogPost.post_id, BlogPost.published_at).where(
+        BlogPost.blog_id == blog.id, col(BlogPost.post_id).in_(mentions)
+    )
+    posts = session.exec(statement).all()
+    session.exec(  # type: ignore[call-overload]
+        delete(WineMention).where(
+            col(WineMention.blog_post_id).in_([id for id, _, _ in posts])
+        )
+    )
+    rows = [
+        WineMention.model_validate(
+            mention, update={"blog_post_id": id, "published_at": published_at}
+        )
+        for id, post_id, published_at in posts
+        for mention in mentions[post_id]
+    ]
+    session.add_all(rows)
+    session.commit()
+    return len(rows)
+
+
+def update_blog_watermark(
+    *,
+    session: Session,
+    blog_id: uuid.UUID,
+    crawled_at: datetime,
+    last_post_id: str | None = None,
+    first_page_hash: str | None = None,
+    skipped_post_ids: Iterable[str] = (),
+) -> Blog | None:
+    """
+    :param skipped_post_ids: Posts to add to the ones never fetched again
+    """
+    db_blog = session.get(Blog, blog_id)
+    if not db_blog:
+        return None
+    db_blog.last_crawled_at = crawled_at
+    if last_post_id is not None:
+        db_blog.last_post_id = last_post_id
+    if first_page_hash is not None:
+        db_blog.first_page_hash = first_page_hash
+    skipped = set(db_blog.skipped_post_ids or ()) | set(skipped_post_ids)
+    if skipped:
+        db_blog.skipped_post_ids = sorted(skipped)
+    session.add(db_blog)
+    session.commit()
+    session.refresh(db_blog)
+    return db_blog
+
+
+def update_blog_categories(
+    *,
+    session: Session,
+    blog_id: uuid.UUID,
+    categories: dict[str, tuple[int, int | None]],
+    updated_at: datetime,
+) -> Blog | None:
+    db_blog = session.get(Blog, blog_id)
+    if not db_blog:
+        return None
+    db_blog.categories = categories
+    db_blog.categories_updated_at = updated_at
+    session.add(db_blog)
+    session.commit()
+    session.refresh(db_blog)
+    return db_blog
@@ -1,3 +1,6 @@
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
 import sentry_sdk
 from fastapi import FastAPI
 from fastapi.routing import APIRoute
@@ -5,12 +8,29 @@ from starlette.middleware.cors import CORSMiddleware
 
 from app.api.main import api_router
 from app.core.config import settings
+from app.core.http import close_async_client
+from app.services.crawl_scheduler import crawl_scheduler
+from app.services.image_proxy import image_prefetcher
+from app.services.ingestion_pipeline import shutdown_parse_executor
+from app.services.thumbnails import shutdown_thumbnail_executor
 
 
 def custom_generate_unique_id(route: APIRoute) -> str:
     return f"{route.tags[0]}-{route.name}"
 
 
+@asynccontextmanager
+async def lifespan(_app: FastAPI) -> AsyncIterator[None]:
+    if settings.CRAWL_SCHEDULER_ENABLED:
+        crawl_scheduler.start()
+    yield
+    crawl_scheduler.shutdown()
+    await image_prefetcher.shutdown()
+    shutdown_parse_executor()
+    shutdown_thumbnail_executor()
+    await close_async_client()
+
+
 if settings.SENTRY_DSN and settings.ENVIRONMENT != "local":
     sentry_sdk.init(dsn=str(settings.SENTRY_DSN), enable_tracing=True)
 
@@ -18,6 +38,7 @@ app = FastAPI(
     title=settings.PROJECT_NAME,
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
     generate_unique_id_function=custom_generate_unique_id,
+    lifespan=lifespan,
 )
 
 # Set all CORS enabled origins
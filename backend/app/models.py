@@ -1,8 +1,20 @@
 import uuid
 from datetime import datetime
+from typing import Any
 
 from pydantic import EmailStr
-from sqlmodel import JSON, Column, Field, Relationship, SQLModel, Text
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlmodel import (
+    JSON,
+    Column,
+    Computed,
+    Field,
+    Index,
+    Relationship,
+    SQLModel,
+    Text,
+    UniqueConstraint,
+)
 
 
 # Shared properties
@@ -77,7 +89,7 @@ class ItemUpdate(ItemBase):
 class Item(ItemBase, table=True):
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     owner_id: uuid.UUID = Field(
-        foreign_key="user.id", nullable=False, ondelete="CASCADE"
+        foreign_key="user.id", nullable=False, ondelete="CASCADE", index=True
     )
     owner: User | None = Relationship(back_populates="items")
 
@@ -121,12 +133,34 @@ class Blog(SQLModel, table=True):
     blog_owner: str = Field(min_length=1, max_length=255)
     target_category: str | None = Field(default=None, max_length=255)
     description: str | None = Field(default=None, max_length=255)
+    # Crawl watermark: newest logNo up to which every post is stored, time of
+    # the last crawl and a hash of the first title page, so unchanged blogs
+    # can be skipped cheaply
+    last_post_id: str | None = Field(default=None, max_length=255)
+    last_crawled_at: datetime | None = Field(default=None)
+    first_page_hash: str | None = Field(default=None, max_length=64)
+    # Posts that cannot be stored whatever the number of attempts (deleted,
+    # old editor layout, no date), the watermark moves past them
+    skipped_post_ids: list[str] | None = Field(default=None, sa_column=Column(JSON))
+    # Category map of the Naver blog, cached to skip CategoryList.nhn
+    categories: dict[str, Any] | None = Field(default=None, sa_column=Column(JSON))
+    categories_updated_at: datetime | None = Field(default=None)
     created_at: datetime = Field(default_factory=datetime.now)
     updated_at: datetime = Field(default_factory=datetime.now)
     posts: list["BlogPost"] = Relationship(back_populates="blog", cascade_delete=True)
 
 
 class BlogPost(SQLModel, table=True):
+    __table_args__ = (
+        UniqueConstraint("blog_id", "post_id", name="uq_blogpost_blog_id_post_id"),
+        # Keyset pagination of listings, scanned backwards for newest first
+        Index("ix_blogpost_published_at_id", "published_at", "id"),
+        Index("ix_blogpost_blog_id_published_at_id", "blog_id", "published_at", "id"),
+        Index("ix_blogpost_search_vector", "search_vector", postgresql_using="gin"),
+        # ix_blogpost_title_trgm, the fuzzy matching of wine names, is only
+        # created by migration cd40bf6d3acb when pg_trgm is available
+    )
+
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     blog_id: uuid.UUID = Field(
         foreign_key="blog.id", nullable=False, ondelete="CASCADE"
@@ -135,11 +169,58 @@ class BlogPost(SQLModel, table=True):
     url: str = Field(max_length=500)
     post_id: str = Field(min_length=1, max_length=255)
     title: str = Field(min_length=1, max_length=255)
-    published_at: datetime | None = Field(default=None)
+    published_at: datetime
     content: str = Field(sa_column=Column(Text))
     image_urls: list = Field(default_factory=list, sa_column=Column(JSON))
     created_at: datetime = Field(default_factory=datetime.now)
     updated_at: datetime = Field(default_factory=datetime.now)
+    # Maintained by Postgres, the 'simple' config because Korean has no stemmer
+    search_vector: str | None = Field(
+        default=None,
+        sa_column=Column(
+            TSVECTOR,
+            Computed(
+                "setweight(to_tsvector('simple', title), 'A') || "
+                "setweight(to_tsvector('simple', coalesce(content, '')), 'B')",
+                persisted=True,
+            ),
+        ),
+    )
+
+
+# A wine named in a post, with the vintage and price (KRW) quoted next to it
+class WineMentionBase(SQLModel):
+    wine: str = Field(max_length=255)
+    vintage: int | None = None
+    price: int | None = None
+
+
+class WineMention(WineMentionBase, table=True):
+    __table_args__ = (
+        # Who posted a wine lately, newest first
+        Index("ix_winemention_wine_published_at", "wine", "published_at"),
+    )
+
+    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
+    blog_post_id: uuid.UUID = Field(
+        foreign_key="blogpost.id", nullable=False, ondelete="CASCADE", index=True
+    )
+    # Copied from the post so recent mentions are found from the index alone
+    published_at: datetime
+
+
+class WineMentionPublic(WineMentionBase):
+    blog_post_id: uuid.UUID
+    blog_name: str
+    title: str
+    url: str
+    published_at: datetime
+
+
+class WineMentionsPublic(SQLModel):
+    wine: str
+    data: list[WineMentionPublic]
+    count: int
 
 
 class BlogCreate(SQLModel):
@@ -195,6 +276,35 @@ class BlogPostPublic(SQLModel):
 class BlogPostsPublic(SQLModel):
     data: list[BlogPostPublic]
     count: int
+    next_cursor: str | None = None
+
+
+# Listing projection of a post, without its full content
+class BlogPostSummary(SQLModel):
+    id: uuid.UUID
+    blog_name: str
+    url: str
+    post_id: str
+    title: str
+    published_at: datetime
+    excerpt: str
+    image_urls: list[str]
+    image_count: int
+
+
+class BlogPostSummariesPublic(SQLModel):
+    data: list[BlogPostSummary]
+    count: int
+    next_cursor: str | None = None
+
+
+class BlogPostSearchHit(BlogPostSummary):
+    rank: float
+
+
+class BlogPostSearchResults(SQLModel):
+    data: list[BlogPostSearchHit]
+    next_cursor: str | None = None
 
 
 class ProxyImagePublic(SQLModel):
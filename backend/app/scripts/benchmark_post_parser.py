@@ -0,0 +1,43 @@
+"""
+Compare the PostView.nhn parser engines on saved pages
+
+    python -m app.scripts.benchmark_post_parser [page.html ...]
+
+Without arguments the fixtures in app/tests/fixtures are used.
+"""
+
+import functools
+import re
+import sys
+import timeit
+from pathlib import Path
+
+from app.services.naver_post_parser import PARSERS
+
+FIXTURES_DIR = Path(__file__).parent.parent / "tests" / "fixtures"
+ROUNDS = 50
+
+
+def benchmark(paths: list[Path]) -> None:
+    for path in paths:
+        html = path.read_text()
+        match = re.search(r'id="post-view(\d+)"', html)
+        if not match:
+            print(f"{path.name}: no post-view container, skipped")
+            continue
+        post_id = match.group(1)
+
+        print(f"{path.name} ({len(html.encode()) / 1024:.0f} KiB)")
+        timings = {}
+        for engine, parse in PARSERS.items():
+            seconds = timeit.timeit(
+                functools.partial(parse, html, post_id), number=ROUNDS
+            )
+            timings[engine] = seconds / ROUNDS * 1000
+            print(f"  {engine:<12} {timings[engine]:8.2f} ms/post")
+        print(f"  speedup      {timings['html.parser'] / timings['lxml']:8.1f}x")
+
+
+if __name__ == "__main__":
+    paths = [Path(arg) for arg in sys.argv[1:]] or sorted(FIXTURES_DIR.glob("*.html"))
+    benchmark(paths)
@@ -1,38 +1,38 @@
+import asyncio
+
 from sqlmodel import Session, select
 
 from app.core.db import engine
-from app.models import Blog, BlogPost
-from app.services.naver_blog_service import NaverBlogSerivce
-
+from app.core.http import close_async_client
+from app.models import Blog
+from app.services.blog_crawler import CrawlResult, crawl_blog
+from app.services.image_proxy import image_prefetcher
 
-def create_blog_post():
-    with Session(engine) as session:
-        statement = select(Blog).where(Blog.name == "조양마트")
-        blog = session.exec(statement).first()
-        print(blog)
+BLOG_NAME = "조양마트"
 
-    blog_owner = blog.blog_owner
-    target_category = blog.target_category
-    naver_blog_service = NaverBlogSerivce(blog_owner)
-    post_ids = naver_blog_service.get_post_ids(target_category, 1)
 
-    blog_post = naver_blog_service.get_contents(post_ids[0])
+async def crawl(blog: Blog) -> CrawlResult:
+    try:
+        result = await crawl_blog(blog)
+        # The loop ends with this script, let the prefetch queue drain first
+        await image_prefetcher.join()
+        return result
+    finally:
+        await image_prefetcher.shutdown()
+        await close_async_client()
 
-    blog_post_in = {
-        "blog_id": blog.id,
-        "url": f"{blog.url}/{post_ids[0]}",
-        "post_id": post_ids[0],
-        "title": blog_post.title,
-        "published_at": blog_post.published_at,
-        "content": blog_post.content,
-        "image_urls": blog_post.image_urls,
-    }
 
+def create_blog_post() -> None:
     with Session(engine) as session:
-        blog_post = BlogPost.model_validate(blog_post_in)
-        session.add(blog_post)
-        session.commit()
-        session.refresh(blog_post)
+        statement = select(Blog).where(Blog.name == BLOG_NAME)
+        blog = session.exec(statement).first()
+    if blog is None:
+        print(f"Blog {BLOG_NAME} not found")
+        return
+    print(blog)
+
+    result = asyncio.run(crawl(blog))
+    print(result)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,44 @@
+"""
+Extract wine mentions from posts stored before the extractor ran at ingestion
+
+    python -m app.scripts.extract_wine_mentions
+
+Run it again after editing the wine dictionary, mentions are replaced per post.
+"""
+
+from sqlmodel import Session, col, select
+
+from app import crud
+from app.core.db import engine
+from app.models import Blog, BlogPost
+from app.services.wine_extractor import get_wine_extractor
+
+BATCH_SIZE = 500
+
+
+def extract_wine_mentions() -> None:
+    extractor = get_wine_extractor()
+    with Session(engine) as session:
+        blogs = session.exec(select(Blog)).all()
+        for blog in blogs:
+            post_ids = sorted(crud.get_blog_post_ids(session=session, blog_id=blog.id))
+            total = 0
+            for start in range(0, len(post_ids), BATCH_SIZE):
+                statement = select(
+                    BlogPost.post_id, BlogPost.title, BlogPost.content
+                ).where(
+                    BlogPost.blog_id == blog.id,
+                    col(BlogPost.post_id).in_(post_ids[start : start + BATCH_SIZE]),
+                )
+                mentions = {
+                    post_id: extractor.extract(f"{title}\n{content}")
+                    for post_id, title, content in session.exec(statement)
+                }
+                total += crud.replace_wine_mentions(
+                    session=session, blog=blog, mentions=mentions
+                )
+            print(f"{blog.name}: {total} mentions")
+
+
+if __name__ == "__main__":
+    extract_wine_mentions()
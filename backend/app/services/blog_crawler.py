@@ -0,0 +1,217 @@
+import asyncio
+import logging
+import uuid
+from collections.abc import Iterable
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from datetime import datetime
+
+import httpx
+from sqlmodel import Session
+
+from app import crud
+from app.core.config import settings
+from app.core.db import engine
+from app.core.http import is_retryable
+from app.models import Blog, NaverBlogPost
+from app.services.category_cache import (
+    Categories,
+    categories_from_json,
+    category_cache,
+)
+from app.services.image_proxy import image_prefetcher
+from app.services.ingestion_pipeline import fetch_and_parse
+from app.services.naver_blog_service import POST_PAGE_SIZE, AsyncNaverBlogSerivce
+from app.services.wine_extractor import get_wine_extractor
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CATEGORY = "전체글"
+# Posts are upserted in batches while the fetch is still streaming results
+INSERT_BATCH_SIZE = 50
+
+
+@dataclass
+class CrawlResult:
+    blog_id: uuid.UUID
+    skipped: bool = False
+    created: int = 0
+    failed: int = 0
+    images_queued: int = 0
+
+
+def _get_known_post_ids(blog_id: uuid.UUID) -> set[str]:
+    with Session(engine) as session:
+        return crud.get_blog_post_ids(session=session, blog_id=blog_id)
+
+
+def _upsert_blog_posts(
+    blog: Blog, posts: dict[str, NaverBlogPost]
+) -> tuple[int, list[str]]:
+    """
+    :return: Number of posts stored and ids of the invalid posts
+    """
+    extractor = get_wine_extractor()
+    with Session(engine) as session:
+        created, invalid = crud.upsert_blog_posts(
+            session=session, blog=blog, posts=posts
+        )
+        mentions = {
+            post_id: extractor.extract(f"{post.title}\n{post.content}")
+            for post_id, post in posts.items()
+            if post_id not in invalid
+        }
+        crud.replace_wine_mentions(session=session, blog=blog, mentions=mentions)
+        return created, invalid
+
+
+def _update_blog_categories(blog_id: uuid.UUID, categories: Categories) -> None:
+    with Session(engine) as session:
+        crud.update_blog_categories(
+            session=session,
+            blog_id=blog_id,
+            categories=categories,
+            updated_at=datetime.now(),
+        )
+
+
+def _stored_categories(blog: Blog) -> Categories | None:
+    if not blog.categories or blog.categories_updated_at is None:
+        return None
+    if not category_cache.is_fresh(blog.categories_updated_at.timestamp()):
+        return None
+    return categories_from_json(blog.categories)
+
+
+def _update_blog_watermark(
+    blog_id: uuid.UUID,
+    crawled_at: datetime,
+    last_post_id: str | None = None,
+    first_page_hash: str | None = None,
+    skipped_post_ids: Iterable[str] = (),
+) -> None:
+    with Session(engine) as session:
+        crud.update_blog_watermark(
+            session=session,
+            blog_id=blog_id,
+            crawled_at=crawled_at,
+            last_post_id=last_post_id,
+            first_page_hash=first_page_hash,
+            skipped_post_ids=skipped_post_ids,
+        )
+
+
+def _is_temporary(error: Exception | None) -> bool:
+    """
+    Whether a post may be fetched and parsed on a later crawl, as opposed to
+    posts that are gone or that the parser cannot read
+    """
+    return isinstance(error, BrokenProcessPool) or (
+        error is not None and is_retryable(error)
+    )
+
+
+async def crawl_blog(
+    blog: Blog, client: httpx.AsyncClient | None = None
+) -> CrawlResult:
+    """
+    Store the posts published since the last crawl of a blog
+
+    The first title page is fetched and hashed first, when it matches the hash
+    stored on the blog nothing was published and no post body is downloaded.
+    With IMAGE_PREFETCH_ENABLED the images of the new posts are then queued
+    for the background prefetcher, so their first view is as fast as any
+    other.
+    """
+    result = CrawlResult(blog_id=blog.id)
+    crawled_at = datetime.now()
+    category = blog.target_category or DEFAULT_CATEGORY
+
+    # Categories stored on the blog spare the CategoryList.nhn round-trip
+    stored_categories = _stored_categories(blog)
+    service = AsyncNaverBlogSerivce(
+        blog.blog_owner, client=client, categories=stored_categories
+    )
+    if category not in await service.get_categories():
+        # The category may be newer than the cached map
+        await service.load_categories()
+    if service.categories is not stored_categories:
+        await asyncio.to_thread(_update_blog_categories, blog.id, service.categories)
+
+    first_page = await service.get_post_id_page(category)
+    if first_page.content_hash == blog.first_page_hash:
+        await asyncio.to_thread(_update_blog_watermark, blog.id, crawled_at)
+        result.skipped = True
+        return result
+
+    # Everything up to last_post_id is stored, so listing stops there. Newer
+    # posts that failed in an earlier crawl are listed again and retried,
+    # unless they can never be stored.
+    stored_ids = await asyncio.to_thread(_get_known_post_ids, blog.id)
+    stored_ids.update(blog.skipped_post_ids or ())
+    watermark = {blog.last_post_id} if blog.last_post_id else set()
+
+    listed_ids = []
+    for post_id in first_page.post_ids:
+        if post_id in watermark:
+            break
+        listed_ids.append(post_id)
+    else:
+        if len(first_page.post_ids) >= POST_PAGE_SIZE:
+            # The watermark is not on a full first page, keep paging
+            listed_ids = await service.get_post_ids(category, None, known_ids=watermark)
+    post_ids = [post_id for post_id in listed_ids if post_id not in stored_ids]
+
+    batch: dict[str, NaverBlogPost] = {}
+    image_urls: list[str] = []
+    skipped_ids: list[str] = []
+    retry = False
+
+    async def store(posts: dict[str, NaverBlogPost]) -> None:
+        created, invalid = await asyncio.to_thread(_upsert_blog_posts, blog, posts)
+        result.created += created
+        # Invalid posts, e.g. without a title, fail the same way every time
+        result.failed += len(invalid)
+        skipped_ids.extend(invalid)
+        for post_id, post in posts.items():
+            if post_id not in invalid:
+                image_urls.extend(post.image_urls)
+
+    async for fetched in fetch_and_parse(service, post_ids):
+        if fetched.post is None:
+            logger.warning("Cannot fetch post %s: %s", fetched.post_id, fetched.error)
+            result.failed += 1
+            if _is_temporary(fetched.error):
+                retry = True
+            else:
+                skipped_ids.append(fetched.post_id)
+            continue
+        batch[fetched.post_id] = fetched.post
+        if len(batch) >= INSERT_BATCH_SIZE:
+            await store(batch)
+            batch = {}
+    if batch:
+        await store(batch)
+
+    # Keep the old watermark and hash when a post may still succeed, so the
+    # next crawl lists it again. Posts that can never be stored are skipped.
+    if retry:
+        await asyncio.to_thread(
+            _update_blog_watermark,
+            blog.id,
+            crawled_at,
+            skipped_post_ids=skipped_ids,
+        )
+    else:
+        await asyncio.to_thread(
+            _update_blog_watermark,
+            blog.id,
+            crawled_at,
+            first_page.post_ids[0] if first_page.post_ids else None,
+            first_page.content_hash,
+            skipped_ids,
+        )
+
+    if settings.IMAGE_PREFETCH_ENABLED and image_urls:
+        result.images_queued = image_prefetcher.submit(image_urls)
+    return result
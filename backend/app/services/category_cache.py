@@ -0,0 +1,59 @@
+import threading
+import time
+from typing import Any
+
+from app.core.config import settings
+
+Categories = dict[str, tuple[int, int | None]]
+
+
+def categories_from_json(data: dict[str, Any]) -> Categories:
+    """
+    Restore a category map stored in a JSON column, where tuples became lists
+    """
+    return {name: (numbers[0], numbers[1]) for name, numbers in data.items()}
+
+
+class CategoryCache:
+    """
+    In-process TTL cache of category maps keyed by naver_blog_id
+    """
+
+    def __init__(self, ttl_seconds: float) -> None:
+        self.ttl_seconds = ttl_seconds
+        self._entries: dict[str, tuple[float, Categories]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, naver_blog_id: str) -> Categories | None:
+        with self._lock:
+            entry = self._entries.get(naver_blog_id)
+            if entry is None:
+                return None
+            expires_at, categories = entry
+            if expires_at <= time.time():
+                del self._entries[naver_blog_id]
+                return None
+            return categories
+
+    def set(
+        self,
+        naver_blog_id: str,
+        categories: Categories,
+        fetched_at: float | None = None,
+    ) -> None:
+        """
+        :param fetched_at: Unix time the categories were fetched at, defaults to now
+        """
+        expires_at = (fetched_at or time.time()) + self.ttl_seconds
+        with self._lock:
+            self._entries[naver_blog_id] = (expires_at, categories)
+
+    def is_fresh(self, fetched_at: float | None) -> bool:
+        return fetched_at is not None and fetched_at + self.ttl_seconds > time.time()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+category_cache = CategoryCache(settings.NAVER_CATEGORY_CACHE_TTL_SECONDS)
@@ -0,0 +1,130 @@
+import asyncio
+import logging
+import random
+from datetime import datetime, timedelta
+
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from sqlalchemy import Connection, text
+from sqlmodel import Session, select
+
+from app.core.config import settings
+from app.core.db import engine
+from app.models import Blog
+from app.services.blog_crawler import CrawlResult, crawl_blog
+
+logger = logging.getLogger(__name__)
+
+# Postgres advisory lock held by the worker that drives crawling
+CRAWL_LOCK_KEY = 0x77696E65
+
+
+def _get_blogs() -> list[Blog]:
+    with Session(engine) as session:
+        return list(session.exec(select(Blog)).all())
+
+
+class CrawlScheduler:
+    """
+    Crawl every Blog on an interval from inside the API process
+
+    Every uvicorn worker runs a scheduler, but a run only crawls in the worker
+    holding the Postgres advisory lock. The lock is tied to the leader's
+    database session, so when the leader dies another worker takes over on
+    its next run.
+    """
+
+    def __init__(self) -> None:
+        self._scheduler = AsyncIOScheduler()
+        self._lock_connection: Connection | None = None
+
+    def start(self) -> None:
+        # Crawl soon after startup, a deploy would otherwise push the first
+        # run a whole interval out
+        first_run = datetime.now() + timedelta(
+            seconds=random.uniform(0, settings.CRAWL_JITTER_SECONDS)
+        )
+        self._scheduler.add_job(
+            self.run,
+            "interval",
+            minutes=settings.CRAWL_INTERVAL_MINUTES,
+            jitter=settings.CRAWL_JITTER_SECONDS,
+            max_instances=1,
+            coalesce=True,
+            next_run_time=first_run,
+        )
+        self._scheduler.start()
+
+    def shutdown(self) -> None:
+        if self._scheduler.running:
+            self._scheduler.shutdown(wait=False)
+        self._release_leadership()
+
+    def _acquire_leadership(self) -> bool:
+        if self._lock_connection is not None:
+            try:
+                self._lock_connection.execute(text("SELECT 1"))
+                self._lock_connection.commit()
+                return True
+            except Exception:
+                logger.warning("Lost the crawl lock connection")
+                self._release_leadership()
+
+        connection = engine.connect()
+        acquired = connection.execute(
+            text("SELECT pg_try_advisory_lock(:key)"), {"key": CRAWL_LOCK_KEY}
+        ).scalar()
+        connection.commit()
+        if not acquired:
+            connection.close()
+            return False
+        self._lock_connection = connection
+        return True
+
+    def _release_leadership(self) -> None:
+        if self._lock_connection is None:
+            return
+        try:
+            # Pooled connections outlive close(), so unlock explicitly
+            self._lock_connection.execute(
+                text("SELECT pg_advisory_unlock(:key)"), {"key": CRAWL_LOCK_KEY}
+            )
+            self._lock_connection.commit()
+            self._lock_connection.close()
+        except Exception:
+            # A broken connection took the lock with it, never reuse it
+            self._lock_connection.invalidate()
+        self._lock_connection = None
+
+    async def run(self) -> list[CrawlResult]:
+        """
+        Crawl all blogs, at most CRAWL_MAX_CONCURRENCY at a time
+        """
+        if not await asyncio.to_thread(self._acquire_leadership):
+            return []
+
+        blogs = await asyncio.to_thread(_get_blogs)
+        semaphore = asyncio.Semaphore(settings.CRAWL_MAX_CONCURRENCY)
+
+        async def crawl(blog: Blog) -> CrawlResult | None:
+            async with semaphore:
+                try:
+                    return await crawl_blog(blog)
+                except Exception:
+                    logger.exception("Crawling blog %s failed", blog.name)
+                    return None
+
+        results = await asyncio.gather(*(crawl(blog) for blog in blogs))
+        crawled = [result for result in results if result is not None]
+        logger.info(
+            "Crawled %d blogs: %d skipped, %d posts created, %d images queued, "
+            "%d failed",
+            len(crawled),
+            sum(result.skipped for result in crawled),
+            sum(result.created for result in crawled),
+            sum(result.images_queued for result in crawled),
+            len(blogs) - len(crawled),
+        )
+        return crawled
+
+
+crawl_scheduler = CrawlScheduler()
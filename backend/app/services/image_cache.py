@@ -0,0 +1,412 @@
+import contextlib
+import fcntl
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, replace
+from pathlib import Path
+from typing import IO
+
+import httpx
+
+from app.core.config import settings
+
+# Images read this recently may still be being sent by another worker
+EVICTION_GRACE_SECONDS = 5 * 60
+# Temporary files older than this belong to a download that died
+TEMP_FILE_MAX_AGE_SECONDS = 60 * 60
+SWEEP_LOCK_NAME = ".sweep.lock"
+
+
+def normalize_image_url(url: str) -> str:
+    """
+    Canonical form of an image URL, equivalent URLs share one cache entry
+
+    Scheme and host are lowercased, the path is percent-encoded, query
+    parameters are sorted and the fragment is dropped.
+    """
+    parsed = httpx.URL(url)
+    return str(
+        parsed.copy_with(fragment=None, params=sorted(parsed.params.multi_items()))
+    )
+
+
+@dataclass
+class ImageMeta:
+    """
+    What the JSON sidecar of a cached image holds
+
+    ``etag`` is the SHA-256 of the body, ``last_modified`` the upstream
+    Last-Modified header and ``fetched_at`` the Unix time the body was last
+    fetched or revalidated.
+    """
+
+    content_type: str
+    etag: str
+    last_modified: str | None = None
+    fetched_at: float = 0.0
+
+
+@dataclass
+class CachedImage(ImageMeta):
+    path: Path = Path()
+    size: int = 0
+
+
+@dataclass
+class MemoryImage(ImageMeta):
+    body: bytes = b""
+
+
+@dataclass
+class CacheStats:
+    hits: int
+    misses: int
+    evictions: int
+    items: int
+    size: int
+
+
+class MemoryImageCache:
+    """
+    Bounded in-process LRU of small images, in front of the disk cache
+
+    Only images up to ``max_item_bytes`` are kept, so a few large photos
+    cannot push out the thumbnails every page view requests.
+    """
+
+    def __init__(self, max_bytes: int, max_item_bytes: int) -> None:
+        """
+        :param max_bytes: Total size of the bodies held in memory
+        :param max_item_bytes: Largest image worth holding in memory
+        """
+        self.max_bytes = max_bytes
+        self.max_item_bytes = max_item_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[str, MemoryImage] = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def accepts(self, size: int) -> bool:
+        return size <= min(self.max_item_bytes, self.max_bytes)
+
+    def get(self, key: str) -> MemoryImage | None:
+        with self._lock:
+            image = self._entries.get(key)
+            if image is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return image
+
+    def set(self, key: str, image: MemoryImage) -> None:
+        if not self.accepts(len(image.body)):
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._size -= len(old.body)
+            self._entries[key] = image
+            self._size += len(image.body)
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted.body)
+                self.evictions += 1
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                hits=self.hits,
+                misses=self.misses,
+                evictions=self.evictions,
+                items=len(self._entries),
+                size=self._size,
+            )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+
+class ImageCacheWriter:
+    """
+    Temporary file an image is written to before it is added to the cache
+
+    Nothing is visible to readers until ``commit``, closing an uncommitted
+    writer discards the partial download.
+    """
+
+    def __init__(
+        self,
+        cache: "ImageCache",
+        key: str,
+        content_type: str,
+        last_modified: str | None = None,
+    ) -> None:
+        self.cache = cache
+        self.key = key
+        self.content_type = content_type
+        self.last_modified = last_modified
+        self.size = 0
+        self._hash = hashlib.sha256()
+        self._file: IO[bytes] = tempfile.NamedTemporaryFile(
+            dir=cache.temp_directory, delete=False
+        )
+
+    @property
+    def path(self) -> Path:
+        return Path(self._file.name)
+
+    def write(self, chunk: bytes) -> None:
+        self._file.write(chunk)
+        self._hash.update(chunk)
+        self.size += len(chunk)
+
+    def flush(self) -> None:
+        self._file.flush()
+
+    def commit(self) -> CachedImage | None:
+        """
+        Move the file into the cache, None when it is larger than the whole cache
+        """
+        self._file.close()
+        if self.size > self.cache.max_bytes:
+            os.unlink(self._file.name)
+            return None
+        meta = ImageMeta(
+            content_type=self.content_type,
+            etag=self._hash.hexdigest(),
+            last_modified=self.last_modified,
+        )
+        return self.cache.add(self.key, Path(self._file.name), meta)
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self._file.close()
+            os.unlink(self._file.name)
+
+    def __enter__(self) -> "ImageCacheWriter":
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        self.close()
+
+
+class ImageCache:
+    """
+    Content-addressed disk cache of proxied images, shared by every worker
+
+    Images are stored under the SHA-256 of their normalized URL with a small
+    JSON sidecar holding their ``ImageMeta``. The directory is the only index,
+    so an image cached by one process is a hit in all of them. Reads touch the
+    file mtime, and a periodic sweep evicts the least recently used files
+    once the directory outgrows ``max_bytes``.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        max_bytes: int,
+        sweep_seconds: float = 60.0,
+        eviction_grace_seconds: float = EVICTION_GRACE_SECONDS,
+    ) -> None:
+        """
+        :param directory: Cache directory, created on first use
+        :param max_bytes: Total size of cached images before the least recently used are evicted
+        :param sweep_seconds: Longest time between sweeps of one process
+        :param eviction_grace_seconds: Images read this recently are never evicted
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.sweep_seconds = sweep_seconds
+        self.eviction_grace_seconds = eviction_grace_seconds
+        # Directory size at the last sweep plus what this process wrote since
+        self._size = 0
+        self._swept_at = 0.0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(url: str) -> str:
+        return hashlib.sha256(normalize_image_url(url).encode()).hexdigest()
+
+    @staticmethod
+    def variant_key(key: str, variant: str) -> str:
+        """
+        Key of an image derived from the image cached under ``key``
+        """
+        return hashlib.sha256(f"{key}:{variant}".encode()).hexdigest()
+
+    @property
+    def temp_directory(self) -> Path:
+        return self.directory / "tmp"
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / key
+
+    def _read(self, key: str) -> CachedImage | None:
+        path = self._path(key)
+        meta_path = path.with_suffix(".json")
+        try:
+            stat = path.stat()
+            meta = ImageMeta(**json.loads(meta_path.read_text()))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, TypeError):
+            # Written by an older version, drop the entry
+            path.unlink(missing_ok=True)
+            meta_path.unlink(missing_ok=True)
+            return None
+        return CachedImage(**asdict(meta), path=path, size=stat.st_size)
+
+    def _write_meta(self, path: Path, meta: ImageMeta) -> None:
+        """
+        Replace the sidecar of an image at once, readers never see half of it
+        """
+        with tempfile.NamedTemporaryFile(
+            "w", dir=self.temp_directory, delete=False
+        ) as file:
+            json.dump(asdict(meta), file)
+        os.replace(file.name, path.with_suffix(".json"))
+
+    def get(self, key: str) -> CachedImage | None:
+        image = self._read(key)
+        if image is None:
+            return None
+        try:
+            os.utime(image.path)
+        except FileNotFoundError:
+            # Evicted since it was read
+            return None
+        return image
+
+    def writer(
+        self, key: str, content_type: str, last_modified: str | None = None
+    ) -> ImageCacheWriter:
+        self.temp_directory.mkdir(parents=True, exist_ok=True)
+        return ImageCacheWriter(self, key, content_type, last_modified)
+
+    def put(
+        self,
+        key: str,
+        body: bytes,
+        content_type: str,
+        last_modified: str | None = None,
+    ) -> CachedImage | None:
+        """
+        Write a body held in memory, see ``ImageCacheWriter.commit``
+        """
+        with self.writer(key, content_type, last_modified) as writer:
+            writer.write(body)
+            return writer.commit()
+
+    def add(self, key: str, temp_path: Path, meta: ImageMeta) -> CachedImage:
+        """
+        Move a fully written file into the cache, sweeping when it may be full
+        """
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        meta = replace(meta, fetched_at=time.time())
+        self._write_meta(path, meta)
+        os.replace(temp_path, path)
+        image = CachedImage(**asdict(meta), path=path, size=path.stat().st_size)
+
+        with self._lock:
+            self._size += image.size
+            due = (
+                self._size > self.max_bytes
+                or time.monotonic() - self._swept_at > self.sweep_seconds
+            )
+        if due:
+            self.sweep()
+        return image
+
+    def refresh(self, key: str) -> CachedImage | None:
+        """
+        Mark a cached image as just revalidated upstream
+        """
+        image = self._read(key)
+        if image is None:
+            return None
+        image = replace(image, fetched_at=time.time())
+        meta = ImageMeta(
+            content_type=image.content_type,
+            etag=image.etag,
+            last_modified=image.last_modified,
+            fetched_at=image.fetched_at,
+        )
+        self._write_meta(image.path, meta)
+        return image
+
+    def sweep(self) -> int:
+        """
+        Evict the least recently used images until the directory fits in
+        ``max_bytes``, and drop partial downloads of dead processes
+
+        Only one process sweeps at a time, the others skip. Images read within
+        ``eviction_grace_seconds`` are kept, another worker may be sending them.
+
+        :return: Number of images evicted
+        """
+        self.temp_directory.mkdir(parents=True, exist_ok=True)
+        with open(self.directory / SWEEP_LOCK_NAME, "a") as lock_file:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                return 0
+
+            now = time.time()
+            for temp_path in self.temp_directory.iterdir():
+                with contextlib.suppress(FileNotFoundError):
+                    if temp_path.stat().st_mtime < now - TEMP_FILE_MAX_AGE_SECONDS:
+                        temp_path.unlink()
+
+            found = []
+            for path in self.directory.glob("??/*"):
+                if path.suffix == ".json":
+                    continue
+                with contextlib.suppress(FileNotFoundError):
+                    stat = path.stat()
+                    found.append((stat.st_mtime, stat.st_size, path))
+            size = sum(file_size for _, file_size, _ in found)
+
+            evicted = 0
+            for mtime, file_size, path in sorted(found):
+                if size <= self.max_bytes or mtime > now - self.eviction_grace_seconds:
+                    break
+                path.unlink(missing_ok=True)
+                path.with_suffix(".json").unlink(missing_ok=True)
+                size -= file_size
+                evicted += 1
+
+        with self._lock:
+            self._size = size
+            self._swept_at = time.monotonic()
+        return evicted
+
+    def clear(self) -> None:
+        for path in self.directory.glob("??/*"):
+            path.unlink(missing_ok=True)
+        with self._lock:
+            self._size = 0
+
+
+image_cache = ImageCache(
+    settings.IMAGE_CACHE_DIR,
+    settings.IMAGE_CACHE_MAX_BYTES,
+    sweep_seconds=settings.IMAGE_CACHE_SWEEP_SECONDS,
+)
+memory_image_cache = MemoryImageCache(
+    settings.IMAGE_MEMORY_CACHE_MAX_BYTES, settings.IMAGE_MEMORY_CACHE_MAX_ITEM_BYTES
+)
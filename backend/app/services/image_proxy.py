@@ -0,0 +1,495 @@
+import asyncio
+import hashlib
+import logging
+import time
+from collections.abc import AsyncIterator, Iterable
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+
+import anyio
+import httpx
+from PIL import Image
+
+from app.core.config import settings
+from app.core.http import get_async_client
+from app.core.single_flight import SingleFlight
+from app.services.image_cache import (
+    CachedImage,
+    ImageCache,
+    ImageCacheWriter,
+    MemoryImage,
+    image_cache,
+    memory_image_cache,
+)
+from app.services.thumbnails import (
+    ThumbnailFormat,
+    get_thumbnail_executor,
+    render_thumbnail,
+    shutdown_thumbnail_executor,
+)
+
+logger = logging.getLogger(__name__)
+
+StoredImage = CachedImage | MemoryImage
+
+# Bytes read from upstream per chunk, this bounds the memory of one request
+IMAGE_CHUNK_SIZE = 64 * 1024
+# Bytes of a download gathered before they are written, off the event loop
+IMAGE_WRITE_BUFFER_BYTES = 1024 * 1024
+
+UPSTREAM_HEADERS = {"Referer": "https://blog.naver.com/"}
+
+# Naver CDN URLs never change content, a new image gets a new URL
+IMMUTABLE_HOST_SUFFIXES = (".pstatic.net",)
+
+# Variants rendered ahead of time for new posts, the tiles BlogImage requests
+PREFETCH_VARIANTS: tuple[tuple[int | None, int | None, ThumbnailFormat], ...] = (
+    (384, 384, "webp"),
+)
+
+# Keys remembered per set of oversized or unresizable images, a full set is
+# cleared and refilled as images are requested again
+REMEMBERED_KEYS_MAX = 10_000
+
+
+class UpstreamImage:
+    """
+    An image too large to cache, passed through from its open upstream response
+
+    The caller sends ``body`` and then closes it with ``aclose``.
+    """
+
+    def __init__(
+        self,
+        response: httpx.Response,
+        byte_range: str | None = None,
+        writer: ImageCacheWriter | None = None,
+        rest: AsyncIterator[bytes] | None = None,
+    ) -> None:
+        """
+        :param byte_range: Range header the response answers
+        :param writer: Start of the body, already read and decoded
+        :param rest: Decoded chunks after the ones in ``writer``
+        """
+        self.response = response
+        self.byte_range = byte_range
+        self.writer = writer
+        # Raw chunks keep the upstream Content-Length and Content-Encoding valid
+        self.decoded = writer is not None
+        self.body: AsyncIterator[bytes] = response.aiter_raw(IMAGE_CHUNK_SIZE)
+        if writer is not None and rest is not None:
+            self.body = _resume(writer.path, rest)
+        self._claimed = False
+
+    def claim(self, byte_range: str | None) -> bool:
+        """
+        Take the response for a request with this Range, at most once
+
+        Concurrent requests share one download, only the first of them can
+        send its open response.
+        """
+        if self._claimed or byte_range != self.byte_range:
+            return False
+        self._claimed = True
+        return True
+
+    async def aclose(self) -> None:
+        await self.response.aclose()
+        if self.writer is not None:
+            await asyncio.to_thread(self.writer.close)
+
+
+async def _resume(path: Path, rest: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """
+    Chunks of a partial download followed by the rest of the response
+    """
+    async with await anyio.open_file(path, "rb") as file:
+        while chunk := await file.read(IMAGE_CHUNK_SIZE):
+            yield chunk
+    async for chunk in rest:
+        yield chunk
+
+
+# Concurrent misses for the same image share one upstream download
+_downloads: SingleFlight[CachedImage | UpstreamImage | None] = SingleFlight()
+_renders: SingleFlight[StoredImage] = SingleFlight()
+# Images too large to cache, they skip the download
+_oversized_keys: set[str] = set()
+# Variants that cannot be rendered, their original is served without another
+# job for the pool
+_unresizable_keys: set[str] = set()
+
+
+def is_immutable(url: str) -> bool:
+    return httpx.URL(url).host.endswith(IMMUTABLE_HOST_SUFFIXES)
+
+
+def _is_fresh(image: StoredImage, immutable: bool) -> bool:
+    age = time.time() - image.fetched_at
+    return immutable or age < settings.IMAGE_CACHE_REVALIDATE_SECONDS
+
+
+def promote(key: str, image: CachedImage) -> MemoryImage:
+    """
+    Copy a small cached image into the in-memory tier
+    """
+    memory_image = MemoryImage(
+        content_type=image.content_type,
+        etag=image.etag,
+        last_modified=image.last_modified,
+        fetched_at=image.fetched_at,
+        body=image.path.read_bytes(),
+    )
+    memory_image_cache.set(key, memory_image)
+    return memory_image
+
+
+def _remember(keys: set[str], key: str) -> None:
+    if len(keys) >= REMEMBERED_KEYS_MAX:
+        keys.clear()
+    keys.add(key)
+
+
+def _total_size(response: httpx.Response) -> int | None:
+    """
+    Size of the whole file, from the Content-Range of a 206 or the
+    Content-Length of a 200
+    """
+    if response.status_code == 206:
+        _, _, total = response.headers.get("content-range", "").rpartition("/")
+        return int(total) if total.isdigit() else None
+    length = response.headers.get("content-length")
+    return int(length) if length and length.isdigit() else None
+
+
+def _write(writer: ImageCacheWriter, data: bytes, flush: bool = False) -> None:
+    writer.write(data)
+    if flush:
+        writer.flush()
+
+
+async def _download(
+    url: str,
+    key: str,
+    stale: CachedImage | None = None,
+    byte_range: str | None = None,
+) -> CachedImage | UpstreamImage | None:
+    """
+    Download an image into the disk cache
+
+    A file larger than IMAGE_CACHE_MAX_ITEM_BYTES is not downloaded again, its
+    open response is returned to be passed through. None when the file did
+    not fit in the cache after all and must be opened again.
+
+    :param stale: Cached copy to revalidate, its Last-Modified is sent upstream
+        and a 304 keeps it
+    :param byte_range: Range of the request that missed the cache, forwarded
+        so a large file is answered as it was asked for
+    """
+    headers = dict(UPSTREAM_HEADERS)
+    if stale is not None and stale.last_modified:
+        headers["If-Modified-Since"] = stale.last_modified
+    elif stale is None and byte_range:
+        headers["Range"] = byte_range
+
+    client = get_async_client()
+    request = client.build_request("GET", url, headers=headers)
+    response = await client.send(request, stream=True)
+    try:
+        if response.status_code == 304 and stale is not None:
+            await response.aclose()
+            return await asyncio.to_thread(image_cache.refresh, key)
+        response.raise_for_status()
+        total = _total_size(response)
+        if total is None:
+            # A 206 of unknown size is not worth downloading whole
+            oversized = response.status_code == 206
+        else:
+            oversized = total > settings.IMAGE_CACHE_MAX_ITEM_BYTES
+        if oversized:
+            _remember(_oversized_keys, key)
+            return UpstreamImage(response, headers.get("Range"))
+        if response.status_code == 206:
+            # Small enough to cache, which takes the whole file
+            await response.aclose()
+            return await _download(url, key, stale)
+    except BaseException:
+        await response.aclose()
+        raise
+
+    content_type = response.headers.get("content-type", "image/jpeg")
+    last_modified = response.headers.get("last-modified")
+    try:
+        writer = await asyncio.to_thread(
+            image_cache.writer, key, content_type, last_modified
+        )
+    except BaseException:
+        await response.aclose()
+        raise
+    chunks = response.aiter_bytes(IMAGE_CHUNK_SIZE)
+    buffer = bytearray()
+    try:
+        async for chunk in chunks:
+            buffer += chunk
+            # Without a Content-Length the size is only known while reading
+            if writer.size + len(buffer) > settings.IMAGE_CACHE_MAX_ITEM_BYTES:
+                _remember(_oversized_keys, key)
+                await asyncio.to_thread(_write, writer, bytes(buffer), flush=True)
+                return UpstreamImage(response, headers.get("Range"), writer, chunks)
+            if len(buffer) >= IMAGE_WRITE_BUFFER_BYTES:
+                await asyncio.to_thread(_write, writer, bytes(buffer))
+                buffer.clear()
+        await response.aclose()
+        await asyncio.to_thread(_write, writer, bytes(buffer))
+        image = await asyncio.to_thread(writer.commit)
+    except BaseException:
+        await asyncio.to_thread(writer.close)
+        await response.aclose()
+        raise
+    if image is None:
+        _remember(_oversized_keys, key)
+    return image
+
+
+async def open_image_stream(url: str, byte_range: str | None = None) -> UpstreamImage:
+    """
+    Open an upstream image without caching it, the caller closes it
+
+    :param byte_range: Range header to forward, the response is then a 206
+        when the host supports ranges
+    :raises httpx.HTTPError: When the host cannot be reached or answers an error
+    """
+    headers = dict(UPSTREAM_HEADERS)
+    if byte_range:
+        headers["Range"] = byte_range
+    client = get_async_client()
+    request = client.build_request("GET", url, headers=headers)
+    response = await client.send(request, stream=True)
+    if response.is_error:
+        await response.aclose()
+        response.raise_for_status()
+    return UpstreamImage(response, byte_range)
+
+
+async def get_original(
+    url: str, key: str, byte_range: str | None = None
+) -> StoredImage | UpstreamImage:
+    """
+    Get an image from the memory or disk tier, downloading it when missing or
+    stale. Images too large to cache are opened upstream instead.
+
+    :param byte_range: Range of the request, only forwarded upstream for an
+        image that is not cached
+    :raises httpx.HTTPError: When the download fails and no stale copy exists
+    """
+    immutable = is_immutable(url)
+    image = memory_image_cache.get(key)
+    if image is not None and _is_fresh(image, immutable):
+        return image
+    if key in _oversized_keys:
+        return await open_image_stream(url, byte_range)
+
+    cached = await asyncio.to_thread(image_cache.get, key)
+    if cached is not None and _is_fresh(cached, immutable):
+        return cached
+    try:
+        downloaded = await _downloads.do(
+            key, lambda: _download(url, key, cached, byte_range)
+        )
+    except httpx.HTTPError:
+        # A stale copy beats a broken image
+        if cached is not None:
+            return cached
+        raise
+    if isinstance(downloaded, UpstreamImage) and not downloaded.claim(byte_range):
+        # Another request shares the download and sends its response
+        return await open_image_stream(url, byte_range)
+    if downloaded is None:
+        return await open_image_stream(url, byte_range)
+    return downloaded
+
+
+async def _render_variant(
+    variant_key: str,
+    original: StoredImage,
+    width: int | None,
+    height: int | None,
+    image_format: ThumbnailFormat,
+) -> StoredImage:
+    source: Path | bytes = (
+        original.body if isinstance(original, MemoryImage) else original.path
+    )
+    loop = asyncio.get_running_loop()
+    try:
+        body = await loop.run_in_executor(
+            get_thumbnail_executor(),
+            render_thumbnail,
+            source,
+            width,
+            height,
+            image_format,
+        )
+    except BrokenProcessPool:
+        # A worker died, start a new pool for the next render
+        logger.warning("Thumbnail pool broke on %s", variant_key, exc_info=True)
+        shutdown_thumbnail_executor()
+        return original
+    except (OSError, ValueError, Image.DecompressionBombError):
+        # Not something Pillow can decode, or too many pixels to try
+        logger.warning("Cannot resize image %s", variant_key, exc_info=True)
+        _remember(_unresizable_keys, variant_key)
+        return original
+    if body is None:
+        # Animated, the original is served so no frame is lost
+        _remember(_unresizable_keys, variant_key)
+        return original
+
+    content_type = f"image/{image_format}"
+    variant = await asyncio.to_thread(
+        image_cache.put, variant_key, body, content_type, original.last_modified
+    )
+    if variant is not None:
+        return variant
+    return MemoryImage(
+        content_type=content_type,
+        etag=hashlib.sha256(body).hexdigest(),
+        last_modified=original.last_modified,
+        fetched_at=original.fetched_at,
+        body=body,
+    )
+
+
+async def get_variant(
+    url: str,
+    key: str,
+    width: int | None,
+    height: int | None,
+    image_format: ThumbnailFormat,
+    byte_range: str | None = None,
+) -> tuple[str, StoredImage | UpstreamImage]:
+    """
+    Get a resized variant of an image, rendering it in the worker pool once
+
+    Variants are keyed by the URL and size, so a warm variant is found without
+    reading the original. A stale one is rendered again from the original.
+
+    :param byte_range: Range of the request, see ``get_original``
+    :return: Cache key of the image and the image, which is the original when
+        it cannot be resized
+    """
+    variant_key = ImageCache.variant_key(key, f"{width}x{height}.{image_format}")
+    immutable = is_immutable(url)
+    hot = memory_image_cache.get(variant_key)
+    if hot is not None and _is_fresh(hot, immutable):
+        return variant_key, hot
+    if variant_key in _unresizable_keys:
+        return key, await get_original(url, key, byte_range)
+    cached = await asyncio.to_thread(image_cache.get, variant_key)
+    if cached is not None and _is_fresh(cached, immutable):
+        return variant_key, cached
+
+    original = await get_original(url, key, byte_range)
+    if isinstance(original, UpstreamImage):
+        return key, original
+    image = await _renders.do(
+        variant_key,
+        lambda: _render_variant(variant_key, original, width, height, image_format),
+    )
+    return (key if image.etag == original.etag else variant_key), image
+
+
+async def prefetch_image(url: str) -> bool:
+    """
+    Download an image and render its PREFETCH_VARIANTS into the disk cache
+
+    Failures are logged and skipped, prefetching never fails the caller.
+
+    :return: Whether the image is now cached
+    """
+    key = ImageCache.key(url)
+    try:
+        for width, height, image_format in PREFETCH_VARIANTS:
+            _, image = await get_variant(url, key, width, height, image_format)
+            if isinstance(image, UpstreamImage):
+                await image.aclose()
+                return False
+    except Exception:
+        logger.warning("Cannot prefetch image %s", url, exc_info=True)
+        return False
+    return True
+
+
+class ImagePrefetcher:
+    """
+    Background queue warming the image cache
+
+    Callers only enqueue URLs, a fixed number of worker tasks drains the queue
+    so prefetching has its own budget whatever the number of callers. URLs
+    that do not fit in the queue are dropped, the proxy fetches them on their
+    first view instead. Workers start on the running loop with the first
+    ``submit``.
+    """
+
+    def __init__(self, concurrency: int, max_queued: int) -> None:
+        self.concurrency = concurrency
+        self.max_queued = max_queued
+        self._queue: asyncio.Queue[str] | None = None
+        self._workers: list[asyncio.Task[None]] = []
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def submit(self, image_urls: Iterable[str]) -> int:
+        """
+        Queue images for prefetching without waiting for them
+
+        :return: Number of images queued
+        """
+        queue = self._start()
+        queued = 0
+        for url in set(image_urls):
+            try:
+                queue.put_nowait(url)
+            except asyncio.QueueFull:
+                logger.warning("Prefetch queue is full, dropping %s", url)
+                break
+            queued += 1
+        return queued
+
+    async def join(self) -> None:
+        """
+        Wait until every queued image is processed
+        """
+        if self._queue is not None:
+            await self._queue.join()
+
+    async def shutdown(self) -> None:
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._queue = None
+        self._loop = None
+
+    def _start(self) -> "asyncio.Queue[str]":
+        loop = asyncio.get_running_loop()
+        if self._queue is None or self._loop is not loop:
+            # Tasks of a closed loop never run again, start over on this one
+            self._queue = asyncio.Queue(self.max_queued)
+            self._loop = loop
+            self._workers = [
+                loop.create_task(self._work(self._queue))
+                for _ in range(self.concurrency)
+            ]
+        return self._queue
+
+    async def _work(self, queue: "asyncio.Queue[str]") -> None:
+        while True:
+            url = await queue.get()
+            try:
+                await prefetch_image(url)
+            finally:
+                queue.task_done()
+
+
+image_prefetcher = ImagePrefetcher(
+    settings.IMAGE_PREFETCH_CONCURRENCY, settings.IMAGE_PREFETCH_QUEUE_SIZE
+)
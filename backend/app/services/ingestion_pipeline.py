@@ -0,0 +1,119 @@
+import asyncio
+import multiprocessing
+import os
+from collections.abc import AsyncIterator, Iterable
+from concurrent.futures import Executor, ProcessPoolExecutor
+
+from app.core.config import settings
+from app.services.naver_blog_service import (
+    AsyncNaverBlogSerivce,
+    PostContentNotFoundError,
+    PostFetchResult,
+    RawPostView,
+)
+
+_parse_executor: ProcessPoolExecutor | None = None
+
+
+def get_parse_executor() -> ProcessPoolExecutor:
+    """
+    Return the process pool shared by every parse stage of this process
+    """
+    global _parse_executor
+    if _parse_executor is None:
+        # Forking a process that runs an event loop and worker threads is
+        # unsafe, start clean interpreters instead
+        _parse_executor = ProcessPoolExecutor(
+            max_workers=settings.NAVER_PARSE_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _parse_executor
+
+
+def shutdown_parse_executor() -> None:
+    global _parse_executor
+    if _parse_executor is not None:
+        _parse_executor.shutdown(wait=False, cancel_futures=True)
+        _parse_executor = None
+
+
+async def fetch_and_parse(
+    service: AsyncNaverBlogSerivce,
+    post_ids: Iterable[str],
+    *,
+    executor: Executor | None = None,
+    fetch_concurrency: int | None = None,
+    parse_concurrency: int | None = None,
+    queue_size: int | None = None,
+) -> AsyncIterator[PostFetchResult]:
+    """
+    Fetch posts on the event loop and parse them in a process pool
+
+    Fetchers put raw page bytes on a bounded queue and parsers hand them to the
+    executor. When parsing falls behind the queue fills up and fetchers wait,
+    so memory stays bounded however many post ids are given. Results are
+    yielded as they complete, failed posts carry their error.
+
+    :param service: Service of the blog the posts belong to
+    :param post_ids: Post ids to fetch
+    :param executor: Executor for the parse stage, defaults to the shared process pool
+    :param fetch_concurrency: Requests in flight, defaults to NAVER_FETCH_CONCURRENCY
+    :param parse_concurrency: Pages being parsed at once, defaults to NAVER_PARSE_WORKERS
+    :param queue_size: Raw pages waiting to be parsed, defaults to NAVER_PARSE_QUEUE_SIZE
+    """
+    loop = asyncio.get_running_loop()
+    executor = executor or get_parse_executor()
+    fetch_concurrency = fetch_concurrency or settings.NAVER_FETCH_CONCURRENCY
+    parse_concurrency = (
+        parse_concurrency or settings.NAVER_PARSE_WORKERS or os.cpu_count() or 1
+    )
+    queue_size = queue_size or settings.NAVER_PARSE_QUEUE_SIZE
+
+    pending = iter(post_ids)
+    raw_pages: asyncio.Queue[RawPostView | None] = asyncio.Queue(maxsize=queue_size)
+    results: asyncio.Queue[PostFetchResult | None] = asyncio.Queue(maxsize=queue_size)
+
+    async def fetch() -> None:
+        # Fetchers share one iterator, each post id is taken exactly once
+        for post_id in pending:
+            try:
+                raw_page = await service.get_post_view(post_id)
+            except Exception as e:
+                await results.put(PostFetchResult(post_id=post_id, error=e))
+                continue
+            await raw_pages.put(raw_page)
+
+    async def parse() -> None:
+        while (raw_page := await raw_pages.get()) is not None:
+            post_id = raw_page.post_id
+            try:
+                post = await loop.run_in_executor(executor, raw_page.parse)
+            except Exception as e:
+                await results.put(PostFetchResult(post_id=post_id, error=e))
+                continue
+            if post is None:
+                error = PostContentNotFoundError(f"cannot select content in {post_id}")
+                await results.put(PostFetchResult(post_id=post_id, error=error))
+            else:
+                await results.put(PostFetchResult(post_id=post_id, post=post))
+
+    fetchers = [asyncio.create_task(fetch()) for _ in range(fetch_concurrency)]
+    parsers = [asyncio.create_task(parse()) for _ in range(parse_concurrency)]
+
+    async def run() -> None:
+        try:
+            await asyncio.gather(*fetchers)
+            for _ in parsers:
+                await raw_pages.put(None)
+            await asyncio.gather(*parsers)
+        finally:
+            await results.put(None)
+
+    runner = asyncio.create_task(run())
+    try:
+        while (result := await results.get()) is not None:
+            yield result
+        await runner
+    finally:
+        for task in [runner, *fetchers, *parsers]:
+            task.cancel()
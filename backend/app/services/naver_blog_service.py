@@ -1,158 +1,388 @@
+import asyncio
+import hashlib
 import json
-import re
-from datetime import datetime
+from collections.abc import AsyncGenerator, Container, Generator, Iterable
+from dataclasses import dataclass
+from typing import Any
 
-import requests
-from bs4 import BeautifulSoup
+import httpx
 
+from app.core.config import settings
+from app.core.http import get_async_client, request_with_retry, run_sync
 from app.models import NaverBlogPost
+from app.services.category_cache import Categories, category_cache
+from app.services.naver_post_parser import parse_post_view
 
+CATEGORY_LIST_URL = "https://m.blog.naver.com/rego/CategoryList.nhn"
+POST_TITLE_LIST_URL = "http://blog.naver.com/PostTitleListAsync.nhn"
+POST_VIEW_URL = "http://blog.naver.com/PostView.nhn"
 
-class NaverBlogSerivce:
+# Largest countPerPage accepted by PostTitleListAsync.nhn
+POST_PAGE_SIZE = 30
+
+
+@dataclass
+class PostFetchResult:
     """
-    Naver Blog API Service
+    Outcome of fetching one post in a batch, ``error`` is set when ``post`` is None
+    """
+
+    post_id: str
+    post: NaverBlogPost | None = None
+    error: Exception | None = None
+
+
+@dataclass
+class PostIdPage:
+    """
+    One page of the post title list, ``content_hash`` changes whenever the page does
+    """
+
+    post_ids: list[str]
+    content_hash: str
+
+
+@dataclass
+class RawPostView:
+    """
+    Undecoded PostView.nhn body, small enough to ship to a parser process
+    """
+
+    post_id: str
+    body: bytes
+    encoding: str
+
+    def parse(self) -> NaverBlogPost | None:
+        html = self.body.decode(self.encoding, errors="replace")
+        return parse_post_view(html, self.post_id)
+
+
+class PostContentNotFoundError(Exception):
+    pass
+
+
+def parse_categories(text: str) -> Categories:
+    """
+    Parse a CategoryList.nhn response into {category name: (categoryNo, parentCategoryNo)}
+    """
+    data = json.loads(text.split("\n")[1])["result"]["mylogCategoryList"]
+    categories = {
+        d["categoryName"].replace("\xa0", "").replace(" ", ""): (
+            d["categoryNo"],
+            d["parentCategoryNo"],
+        )
+        for d in data
+        if not d["divisionLine"]
+    }
+    categories["전체글"] = (0, None)
+    return categories
+
+
+def parse_post_ids(text: str) -> list[str]:
+    """
+    Parse a PostTitleListAsync.nhn response into post ids, newest first
     """
+    data = json.loads(text.replace("\\", "\\\\"))
+    return [d["logNo"] for d in data["postList"]]
 
-    def __init__(self, naver_blog_id: str) -> None:
+
+class AsyncNaverBlogSerivce:
+    """
+    Naver Blog API Service on top of the shared keep-alive ``httpx.AsyncClient``
+
+    Construction never touches the network. Categories are resolved on first
+    use from the constructor argument, the process-wide category cache or
+    CategoryList.nhn, in that order.
+    """
+
+    def __init__(
+        self,
+        naver_blog_id: str,
+        client: httpx.AsyncClient | None = None,
+        categories: Categories | None = None,
+    ) -> None:
         """
         Initialize Naver Blog API Service
 
         :param naver_blog_id: Naver blog id (e.g. "joyangmart" from https://blog.naver.com/joyangmart)
+        :param client: HTTP client to use, defaults to the pooled client of the running loop
+        :param categories: Known category map, skips the category lookup entirely
         """
         self.naver_blog_id = naver_blog_id
-        self._get_categories()
+        self.categories: Categories = categories or {}
+        self._client = client
+
+    @classmethod
+    async def create(
+        cls, naver_blog_id: str, client: httpx.AsyncClient | None = None
+    ) -> "AsyncNaverBlogSerivce":
+        """
+        Create a service with its categories already loaded
+        """
+        service = cls(naver_blog_id, client=client)
+        await service.get_categories()
+        return service
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        return self._client or get_async_client()
+
+    async def _get(self, url: str, **kwargs: Any) -> httpx.Response:
+        """
+        GET through the per-host rate limiter, retrying throttling and outages
+        """
+        return await request_with_retry(self.client, "GET", url, **kwargs)
+
+    async def get_categories(self) -> Categories:
+        """
+        Get the category map, fetching it only when it is not cached
+        """
+        if not self.categories:
+            cached = category_cache.get(self.naver_blog_id)
+            if cached is not None:
+                self.categories = cached
+            else:
+                await self.load_categories()
+        return self.categories
 
-    def _get_categories(self):
-        response = requests.get(
-            f"https://m.blog.naver.com/rego/CategoryList.nhn?blogId={self.naver_blog_id}",
+    async def load_categories(self) -> None:
+        """
+        Fetch the category map from Naver and refresh the cache
+        """
+        response = await self._get(
+            CATEGORY_LIST_URL,
+            params={"blogId": self.naver_blog_id},
             headers={"Referer": "https://m.blog.naver.com"},
         )
+        self.categories = parse_categories(response.text)
+        category_cache.set(self.naver_blog_id, self.categories)
 
-        data = json.loads(response.text.split("\n")[1])["result"]["mylogCategoryList"]
-        self.categories = {
-            d["categoryName"].replace("\xa0", "").replace(" ", ""): (
-                d["categoryNo"],
-                d["parentCategoryNo"],
-            )
-            for d in data
-            if not d["divisionLine"]
-        }
-        self.categories["전체글"] = (0, None)
-
-    def category_names(self):
+    def category_names(self) -> list[str]:
         """
         Get all category names regardless of parent category
         """
         return list(self.categories.keys())
 
-    def get_post_ids(self, category_name: str, count: int = 5) -> list[str]:
+    async def get_post_id_page(
+        self, category_name: str, page: int = 1, page_size: int = POST_PAGE_SIZE
+    ) -> PostIdPage:
         """
-        Get post ids in a category
+        Get one page of post ids in a category, newest first
 
         :param category_name: Category name to get post ids
-        :param count: Number of posts to get
-        :return: A list of post ids
+        :param page: 1-based page number
+        :param page_size: Number of posts per page
         """
-
-        url = "http://blog.naver.com/PostTitleListAsync.nhn"
-        post_ids = set()
-
+        category_no, parent_category_no = (await self.get_categories())[category_name]
         params = {
             "blogId": self.naver_blog_id,
-            "currentPage": 1,
-            "categoryNo": self.categories[category_name][0],
-            "parentCategoryNo": self.categories[category_name][1],
-            "countPerPage": count,
+            "currentPage": page,
+            "categoryNo": category_no,
+            "parentCategoryNo": parent_category_no,
+            "countPerPage": page_size,
             "viewdate": "",
         }
+        response = await self._get(
+            POST_TITLE_LIST_URL,
+            params={k: v for k, v in params.items() if v is not None},
+        )
+        return PostIdPage(
+            post_ids=parse_post_ids(response.text),
+            content_hash=hashlib.sha256(response.content).hexdigest(),
+        )
+
+    async def get_post_ids(
+        self,
+        category_name: str,
+        count: int | None = 5,
+        known_ids: Container[str] = (),
+        page_size: int = POST_PAGE_SIZE,
+    ) -> list[str]:
+        """
+        Get post ids in a category, walking the title list page by page
+
+        Paging stops at the first post id found in ``known_ids``, so passing the
+        ids that are already stored makes every crawl incremental.
+
+        :param category_name: Category name to get post ids
+        :param count: Maximum number of posts to get, None for no limit
+        :param known_ids: Post ids that are already stored
+        :param page_size: Number of posts requested per page
+        :return: A list of post ids
+        :raises httpx.HTTPError: When a page still fails after retries
+        """
+        if count is not None:
+            page_size = min(page_size, count)
+
+        post_ids: list[str] = []
+        seen: set[str] = set()
+        page = 1
+        while True:
+            ids = (await self.get_post_id_page(category_name, page, page_size)).post_ids
+
+            # Naver keeps answering with the last page once we run past the end
+            if not ids or ids[0] in seen:
+                break
+
+            for post_id in ids:
+                if post_id in known_ids or (
+                    count is not None and len(post_ids) >= count
+                ):
+                    return sorted(post_ids)
+                post_ids.append(post_id)
+                seen.add(post_id)
+
+            if len(ids) < page_size or (count is not None and len(post_ids) >= count):
+                break
+            page += 1
 
-        try:
-            response = requests.get(url, params=params)
-            data = json.loads(response.text.replace("\\", "\\\\"))
-            lists = data["postList"]
-        except Exception as e:
-            print(f"API Error occured restart... {e}")
-            return []
-
-        ids = [d["logNo"] for d in lists]
-
-        if ids[0] not in post_ids:
-            post_ids.update(ids)
-            params["currentPage"] += 1
-        else:
-            print(f"Get post ids: {len(post_ids)} posts found.")
         return sorted(post_ids)
 
-    def _parse_naver_date(self, date_str: str) -> datetime | None:
+    async def get_post_view(self, post_id: str) -> RawPostView:
+        """
+        Download a post page without parsing it
+        """
+        response = await self._get(
+            POST_VIEW_URL, params={"blogId": self.naver_blog_id, "logNo": post_id}
+        )
+        return RawPostView(
+            post_id=post_id,
+            body=response.content,
+            encoding=response.encoding or "utf-8",
+        )
+
+    async def get_contents(self, post_id: str) -> NaverBlogPost | None:
         """
-        Parse Naver blog date format (e.g., "2025. 7. 24. 16:13") to datetime
+        Get contents of a post
         """
+        return (await self.get_post_view(post_id)).parse()
+
+    async def get_contents_many(
+        self, post_ids: Iterable[str], concurrency: int | None = None
+    ) -> AsyncGenerator[PostFetchResult, None]:
+        """
+        Get contents of many posts concurrently
+
+        Results are yielded as soon as each post finishes, not in input order. A
+        failing post is yielded with its error instead of aborting the batch.
+
+        :param post_ids: Post ids to fetch
+        :param concurrency: Maximum number of posts in flight, defaults to NAVER_FETCH_CONCURRENCY
+        """
+        semaphore = asyncio.Semaphore(concurrency or settings.NAVER_FETCH_CONCURRENCY)
+
+        async def fetch(post_id: str) -> PostFetchResult:
+            async with semaphore:
+                try:
+                    post = await self.get_contents(post_id)
+                except Exception as e:
+                    return PostFetchResult(post_id=post_id, error=e)
+            if post is None:
+                error = PostContentNotFoundError(f"cannot select content in {post_id}")
+                return PostFetchResult(post_id=post_id, error=error)
+            return PostFetchResult(post_id=post_id, post=post)
+
+        tasks = [asyncio.create_task(fetch(post_id)) for post_id in post_ids]
         try:
-            # Clean and split the date string
-            parts = date_str.strip().split(".")
-            if len(parts) < 4:
-                return None
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+
+
+class NaverBlogSerivce:
+    """
+    Naver Blog API Service
 
-            # Extract year, month, day
-            year = int(parts[0])
-            month = int(parts[1])
-            day = int(parts[2])
+    Blocking wrapper around ``AsyncNaverBlogSerivce``, every call runs on the
+    shared background loop so connections are pooled across calls.
+    """
 
-            # Extract time (format: " 16:13")
-            time_str = parts[3].strip()
-            hour, minute = map(int, time_str.split(":"))
+    def __init__(
+        self,
+        naver_blog_id: str,
+        categories: Categories | None = None,
+        lazy: bool = False,
+        client: httpx.AsyncClient | None = None,
+    ) -> None:
+        """
+        Initialize Naver Blog API Service
+
+        :param naver_blog_id: Naver blog id (e.g. "joyangmart" from https://blog.naver.com/joyangmart)
+        :param categories: Known category map, skips the category lookup entirely
+        :param lazy: Defer the category lookup until it is first needed
+        :param client: HTTP client to use on the background loop, defaults to its
+            pooled client
+        """
+        self.naver_blog_id = naver_blog_id
+        self._service = AsyncNaverBlogSerivce(
+            naver_blog_id, client=client, categories=categories
+        )
+        if not lazy:
+            run_sync(self._service.get_categories())
+
+    @property
+    def categories(self) -> Categories:
+        if not self._service.categories:
+            run_sync(self._service.get_categories())
+        return self._service.categories
+
+    def category_names(self) -> list[str]:
+        """
+        Get all category names regardless of parent category
+        """
+        return list(self.categories.keys())
 
-            return datetime(year, month, day, hour, minute)
+    def get_post_ids(
+        self,
+        category_name: str,
+        count: int | None = 5,
+        known_ids: Container[str] = (),
+        page_size: int = POST_PAGE_SIZE,
+    ) -> list[str]:
+        """
+        Get post ids in a category, see ``AsyncNaverBlogSerivce.get_post_ids``
 
-        except (ValueError, IndexError):
-            return None
+        :param category_name: Category name to get post ids
+        :param count: Maximum number of posts to get, None for no limit
+        :param known_ids: Post ids that are already stored
+        :param page_size: Number of posts requested per page
+        :return: A list of post ids
+        :raises httpx.HTTPError: When a page still fails after retries
+        """
+        return run_sync(
+            self._service.get_post_ids(category_name, count, known_ids, page_size)
+        )
 
     def get_contents(self, post_id: str) -> NaverBlogPost | None:
         """
         Get contents of a post
         """
-        url = "http://blog.naver.com/PostView.nhn"
-        params = {"blogId": self.naver_blog_id, "logNo": post_id}
+        return run_sync(self._service.get_contents(post_id))
 
-        response = requests.get(url, params=params)
-        soup = BeautifulSoup(response.text, "html.parser")
+    def get_contents_many(
+        self, post_ids: Iterable[str], concurrency: int | None = None
+    ) -> Generator[PostFetchResult, None, None]:
+        """
+        Get contents of many posts concurrently, see ``AsyncNaverBlogSerivce.get_contents_many``
 
-        # Extract title and date
-        title_div = soup.select_one(f"#post-view{post_id} > div > div.se-documentTitle")
-        title = ""
-        published_at = None
+        Closing the generator early cancels the fetches still in flight.
+        """
+        results = self._service.get_contents_many(post_ids, concurrency)
 
-        if title_div:
-            title_elem = title_div.select_one(".se-title-text")
-            if title_elem:
-                title = title_elem.get_text().strip()
+        # run_sync takes coroutines, the generator methods only return awaitables
+        async def next_result() -> PostFetchResult:
+            return await results.__anext__()
 
-            date_elem = title_div.select_one(".se_publishDate")
-            if date_elem:
-                date_str = date_elem.get_text().strip()
-                published_at = self._parse_naver_date(date_str)
+        async def close() -> None:
+            await results.aclose()
 
-        # Extract content
-        content_div = soup.select_one(
-            f"#post-view{post_id} > div > div.se-main-container"
-        )
-        if not content_div:
-            print(f"[Error] cannot select content in {post_id}.")
-            return None
-
-        content = content_div.get_text("\n").replace("\xa0", " ")
-        content = re.sub(r"\s+", " ", content).strip()
-
-        # Extract images
-        images = []
-        for img_tag in content_div.find_all("img"):
-            img_src = img_tag.get("src")
-            if img_src:
-                # Optimize image URL
-                if "?" in img_src:
-                    img_src = img_src.split("?")[0] + "?type=w966"
-                images.append(img_src)
-
-        return NaverBlogPost(
-            title=title, published_at=published_at, content=content, image_urls=images
-        )
+        try:
+            while True:
+                try:
+                    yield run_sync(next_result())
+                except StopAsyncIteration:
+                    return
+        finally:
+            run_sync(close())
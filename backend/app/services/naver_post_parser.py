@@ -0,0 +1,176 @@
+import logging
+import re
+from collections.abc import Callable
+from datetime import datetime
+from typing import Literal
+
+from bs4 import BeautifulSoup, Tag
+from lxml import etree
+
+from app.core.config import settings
+from app.models import NaverBlogPost
+
+logger = logging.getLogger(__name__)
+
+ParserEngine = Literal["lxml", "html.parser"]
+
+
+def _class_xpath(class_name: str) -> str:
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {class_name} ')"
+
+
+def parse_naver_date(date_str: str) -> datetime | None:
+    """
+    Parse Naver blog date format (e.g., "2025. 7. 24. 16:13") to datetime
+    """
+    try:
+        # Clean and split the date string
+        parts = date_str.strip().split(".")
+        if len(parts) < 4:
+            return None
+
+        # Extract year, month, day
+        year = int(parts[0])
+        month = int(parts[1])
+        day = int(parts[2])
+
+        # Extract time (format: " 16:13")
+        time_str = parts[3].strip()
+        hour, minute = map(int, time_str.split(":"))
+
+        return datetime(year, month, day, hour, minute)
+
+    except (ValueError, IndexError):
+        return None
+
+
+def _normalize_content(text: str) -> str:
+    return re.sub(r"\s+", " ", text.replace("\xa0", " ")).strip()
+
+
+def _normalize_image_url(img_src: str) -> str:
+    # Optimize image URL
+    if "?" in img_src:
+        img_src = img_src.split("?")[0] + "?type=w966"
+    return img_src
+
+
+def parse_post_view_bs4(html: str, post_id: str) -> NaverBlogPost | None:
+    """
+    Parse a PostView.nhn page with BeautifulSoup's pure-Python html.parser
+    """
+    soup = BeautifulSoup(html, "html.parser")
+
+    # Extract title and date
+    title_div = soup.select_one(f"#post-view{post_id} > div > div.se-documentTitle")
+    title = ""
+    published_at = None
+
+    if title_div:
+        title_elem = title_div.select_one(".se-title-text")
+        if title_elem:
+            title = title_elem.get_text().strip()
+
+        date_elem = title_div.select_one(".se_publishDate")
+        if date_elem:
+            date_str = date_elem.get_text().strip()
+            published_at = parse_naver_date(date_str)
+
+    # Extract content
+    content_div = soup.select_one(f"#post-view{post_id} > div > div.se-main-container")
+    if not content_div:
+        logger.warning("Cannot select content in %s", post_id)
+        return None
+
+    content = _normalize_content(content_div.get_text("\n"))
+
+    # Extract images
+    images = [
+        _normalize_image_url(src)
+        for img_tag in content_div.find_all("img")
+        if isinstance(img_tag, Tag) and isinstance(src := img_tag.get("src"), str)
+    ]
+
+    return NaverBlogPost(
+        title=title, published_at=published_at, content=content, image_urls=images
+    )
+
+
+def parse_post_view_lxml(html: str, post_id: str) -> NaverBlogPost | None:
+    """
+    Parse a PostView.nhn page with lxml, only walking the SmartEditor nodes we need
+    """
+    # Skip the script-heavy <head> and blog chrome before the post, libxml2
+    # wraps the remaining fragment in html/body on its own
+    marker = html.find(f'id="post-view{post_id}"')
+    if marker != -1:
+        html = html[html.rfind("<", 0, marker) :]
+
+    document = etree.HTML(html)
+    if document is None:
+        logger.warning("Cannot parse %s", post_id)
+        return None
+    post_view = document.xpath(f"//*[@id='post-view{post_id}']/div")
+
+    # Extract title and date
+    title = ""
+    published_at = None
+    title_divs = [
+        div
+        for parent in post_view
+        for div in parent.xpath(f"./div[{_class_xpath('se-documentTitle')}]")
+    ]
+    if title_divs:
+        title_elems = title_divs[0].xpath(f".//*[{_class_xpath('se-title-text')}]")
+        if title_elems:
+            title = "".join(title_elems[0].itertext()).strip()
+
+        date_elems = title_divs[0].xpath(f".//*[{_class_xpath('se_publishDate')}]")
+        if date_elems:
+            date_str = "".join(date_elems[0].itertext()).strip()
+            published_at = parse_naver_date(date_str)
+
+    # Extract content
+    content_divs = [
+        div
+        for parent in post_view
+        for div in parent.xpath(f"./div[{_class_xpath('se-main-container')}]")
+    ]
+    if not content_divs:
+        logger.warning("Cannot select content in %s", post_id)
+        return None
+    content_div = content_divs[0]
+
+    # html.parser's get_text() skips script and style bodies, do the same
+    etree.strip_elements(content_div, "script", "style", with_tail=False)
+    content = _normalize_content(" ".join(content_div.itertext()))
+
+    # Extract images
+    images = [
+        _normalize_image_url(img_tag.get("src"))
+        for img_tag in content_div.iter("img")
+        if img_tag.get("src")
+    ]
+
+    return NaverBlogPost(
+        title=title, published_at=published_at, content=content, image_urls=images
+    )
+
+
+PARSERS: dict[str, Callable[[str, str], NaverBlogPost | None]] = {
+    "lxml": parse_post_view_lxml,
+    "html.parser": parse_post_view_bs4,
+}
+
+
+def parse_post_view(
+    html: str, post_id: str, engine: ParserEngine | None = None
+) -> NaverBlogPost | None:
+    """
+    Parse a PostView.nhn page into a NaverBlogPost
+
+    :param html: Decoded page body
+    :param post_id: Post id (logNo) of the page
+    :param engine: Parser engine, defaults to NAVER_HTML_PARSER
+    """
+    return PARSERS[engine or settings.NAVER_HTML_PARSER](html, post_id)
@@ -0,0 +1,91 @@
+import io
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Literal
+
+from PIL import Image, ImageOps
+
+from app.core.config import settings
+
+ThumbnailFormat = Literal["webp", "jpeg", "png"]
+
+# Requested sizes are rounded up to one of these, so a handful of variants
+# per image serve every layout
+THUMBNAIL_SIZES = (64, 128, 256, 384, 512, 768, 1024)
+THUMBNAIL_QUALITY = 80
+
+_thumbnail_executor: ProcessPoolExecutor | None = None
+
+
+def snap_size(size: int | None) -> int | None:
+    """
+    Round a requested edge length up to the nearest size bucket
+    """
+    if size is None:
+        return None
+    return next(
+        (bucket for bucket in THUMBNAIL_SIZES if bucket >= size), THUMBNAIL_SIZES[-1]
+    )
+
+
+def render_thumbnail(
+    source: Path | bytes,
+    width: int | None,
+    height: int | None,
+    image_format: ThumbnailFormat,
+) -> bytes | None:
+    """
+    Resize and recompress an image
+
+    With both ``width`` and ``height`` the image is cropped to fill the box,
+    like ``object-fit: cover``. With one of them the aspect ratio is kept.
+    Images are never enlarged.
+
+    :param source: Path of the original image or its bytes
+    :return: None for animated images, a thumbnail would keep only one frame
+    """
+    with Image.open(
+        io.BytesIO(source) if isinstance(source, bytes) else source
+    ) as opened:
+        if getattr(opened, "is_animated", False):
+            return None
+        image = ImageOps.exif_transpose(opened)
+        if width and height:
+            box = (min(width, image.width), min(height, image.height))
+            image = ImageOps.fit(image, box, Image.Resampling.LANCZOS)
+        elif width or height:
+            image.thumbnail(
+                (width or image.width, height or image.height), Image.Resampling.LANCZOS
+            )
+
+        if image_format == "jpeg" or not image.has_transparency_data:
+            image = image.convert("RGB")
+        elif image.mode != "RGBA":
+            image = image.convert("RGBA")
+
+        output = io.BytesIO()
+        image.save(
+            output, format=image_format, quality=THUMBNAIL_QUALITY, optimize=True
+        )
+        return output.getvalue()
+
+
+def get_thumbnail_executor() -> ProcessPoolExecutor:
+    """
+    Return the process pool thumbnails are rendered in
+    """
+    global _thumbnail_executor
+    if _thumbnail_executor is None:
+        _thumbnail_executor = ProcessPoolExecutor(
+            max_workers=settings.IMAGE_RESIZE_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _thumbnail_executor
+
+
+def shutdown_thumbnail_executor() -> None:
+    global _thumbnail_executor
+    if _thumbnail_executor is not None:
+        _thumbnail_executor.shutdown(wait=False, cancel_futures=True)
+        _thumbnail_executor = None
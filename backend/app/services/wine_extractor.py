@@ -0,0 +1,188 @@
+import csv
+import functools
+import re
+from collections import deque
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import Generic, TypeVar
+
+from app.core.config import settings
+from app.models import WineMentionBase
+
+T = TypeVar("T")
+
+# Characters after a wine name searched for its vintage and price
+CONTEXT_CHARS = 60
+MIN_PRICE = 1_000
+MAX_PRICE = 100_000_000
+
+_ACCENTS = str.maketrans("àâäáãåçéèêëíìîïñóòôöõúùûüýÿ", "aaaaaaceeeeiiiinooooouuuuyy")
+_VINTAGE = re.compile(r"(?<![\d,.])(19[5-9]\d|20[0-4]\d)(?!\d|,\d{3})")
+_PRICE = re.compile(
+    r"₩\s*(?P<won>\d{1,3}(?:,\d{3})+|\d+)"
+    r"|(?P<amount>\d{1,3}(?:,\d{3})+|\d+(?:\.\d+)?)\s*(?P<man>만)?\s*원"
+)
+
+
+def _fold(text: str) -> str:
+    """
+    Case and accent folding that keeps every character at its offset
+    """
+    return text.lower().translate(_ACCENTS)
+
+
+class AhoCorasick(Generic[T]):
+    """
+    Automaton finding every occurrence of many patterns in one pass over a
+    text, in time linear in the text length plus the number of matches
+    """
+
+    def __init__(self, patterns: Iterable[tuple[str, T]]) -> None:
+        """
+        :param patterns: Pattern strings and the value reported for each
+        """
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._output: list[list[tuple[int, T]]] = [[]]
+        for pattern, value in patterns:
+            if pattern:
+                self._add(pattern, value)
+        self._link()
+
+    def _add(self, pattern: str, value: T) -> None:
+        state = 0
+        for char in pattern:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            state = next_state
+        self._output[state].append((len(pattern), value))
+
+    def _link(self) -> None:
+        """
+        Set the failure links breadth first, every state then also reports
+        the patterns that end in its longest proper suffix
+        """
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                self._output[next_state] += self._output[self._fail[next_state]]
+
+    def iter_matches(self, text: str) -> Iterator[tuple[int, int, T]]:
+        """
+        :return: Start offset, end offset and value of each occurrence
+        """
+        state = 0
+        for end, char in enumerate(text, start=1):
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            for length, value in self._output[state]:
+                yield end - length, end, value
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isascii() and char.isalnum()
+
+
+def _parse_price(match: re.Match[str]) -> int:
+    if match["won"]:
+        return int(match["won"].replace(",", ""))
+    amount = float(match["amount"].replace(",", ""))
+    return round(amount * 10_000) if match["man"] else round(amount)
+
+
+class WineExtractor:
+    """
+    Finds dictionary wines in post text with the vintage and price quoted
+    right after each name
+    """
+
+    def __init__(self, aliases: dict[str, str]) -> None:
+        """
+        :param aliases: Every spelling of a wine mapped to its canonical name
+        """
+        self._names = {_fold(alias): name for alias, name in aliases.items()}
+        self._matcher = AhoCorasick(self._names.items())
+
+    @classmethod
+    def from_csv(cls, path: Path) -> "WineExtractor":
+        """
+        Load a dictionary with ``name`` and ``|``-separated ``aliases`` columns
+        """
+        aliases = {}
+        with path.open(encoding="utf-8", newline="") as file:
+            for row in csv.DictReader(file):
+                aliases[row["name"]] = row["name"]
+                for alias in row["aliases"].split("|"):
+                    if alias.strip():
+                        aliases[alias.strip()] = row["name"]
+        return cls(aliases)
+
+    def canonical_name(self, name: str) -> str | None:
+        return self._names.get(_fold(name.strip()))
+
+    def _find_names(self, text: str) -> list[tuple[int, int, str]]:
+        """
+        Leftmost-longest, non-overlapping matches that do not cut a Latin word
+        """
+        found = sorted(
+            self._matcher.iter_matches(text), key=lambda m: (m[0], m[0] - m[1])
+        )
+        names = []
+        last_end = 0
+        for start, end, name in found:
+            if start < last_end:
+                continue
+            if _is_word_char(text[start]) and start and _is_word_char(text[start - 1]):
+                continue
+            if (
+                _is_word_char(text[end - 1])
+                and end < len(text)
+                and _is_word_char(text[end])
+            ):
+                continue
+            names.append((start, end, name))
+            last_end = end
+        return names
+
+    def extract(self, text: str) -> list[WineMentionBase]:
+        """
+        :return: Distinct mentions in order of first appearance
+        """
+        text = _fold(text)
+        names = self._find_names(text)
+        mentions: dict[tuple[str, int | None, int | None], WineMentionBase] = {}
+        for i, (_, end, name) in enumerate(names):
+            # The context ends where the next wine starts
+            stop = names[i + 1][0] if i + 1 < len(names) else len(text)
+            context = text[end : min(end + CONTEXT_CHARS, stop)]
+
+            vintage_match = _VINTAGE.search(context)
+            vintage = int(vintage_match[1]) if vintage_match else None
+            price = None
+            for price_match in _PRICE.finditer(context):
+                candidate = _parse_price(price_match)
+                if MIN_PRICE <= candidate <= MAX_PRICE:
+                    price = candidate
+                    break
+            mentions.setdefault(
+                (name, vintage, price),
+                WineMentionBase(wine=name, vintage=vintage, price=price),
+            )
+        return list(mentions.values())
+
+
+@functools.cache
+def get_wine_extractor() -> WineExtractor:
+    return WineExtractor.from_csv(settings.WINE_DICTIONARY_PATH)
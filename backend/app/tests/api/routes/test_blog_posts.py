@@ -0,0 +1,197 @@
+import uuid
+from datetime import datetime
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from app.api.counts import count_cache
+from app.api.routes.blog_posts import _has_trigram_search, make_excerpt
+from app.core.config import settings
+from app.core.db import engine
+from app.crud import SUMMARY_EXCERPT_LENGTH, SUMMARY_IMAGE_COUNT
+from app.models import BlogPost
+from app.tests.utils.blog import create_random_blog, create_random_blog_post
+from app.tests.utils.query_plan import capture_selects
+from app.tests.utils.utils import random_lower_string
+
+
+def test_make_excerpt() -> None:
+    assert make_excerpt("  짧은\n\n와인   노트 ") == "짧은 와인 노트"
+    assert make_excerpt("one two three", length=9) == "one two…"
+
+
+def test_read_blog_post_summaries(client: TestClient, db: Session) -> None:
+    blog = create_random_blog(db)
+    older = create_random_blog_post(
+        db, blog.id, post_id="100", published_at=datetime(2025, 1, 1)
+    )
+    newer = create_random_blog_post(
+        db, blog.id, post_id="200", published_at=datetime(2025, 2, 1)
+    )
+    newer.content = "와인 " * 1000
+    newer.image_urls = [f"https://postfiles.pstatic.net/{i}.jpg" for i in range(10)]
+    db.add(newer)
+    db.commit()
+
+    response = client.get(
+        f"{settings.API_V1_STR}/blog/posts/summary", params={"blog_id": str(blog.id)}
+    )
+    assert response.status_code == 200
+    content = response.json()
+    assert content["count"] == 2
+    first, second = content["data"]
+    assert first["id"] == str(newer.id)
+    assert first["blog_name"] == blog.name
+    assert "content" not in first
+    assert first["excerpt"].endswith("…")
+    assert len(first["excerpt"]) <= SUMMARY_EXCERPT_LENGTH + 1
+    assert first["image_urls"] == newer.image_urls[:SUMMARY_IMAGE_COUNT]
+    assert first["image_count"] == 10
+    assert second["id"] == str(older.id)
+    assert second["excerpt"] == older.content
+    assert second["image_urls"] == []
+    assert second["image_count"] == 0
+
+
+def test_read_blog_post_summaries_blog_not_found(client: TestClient) -> None:
+    response = client.get(
+        f"{settings.API_V1_STR}/blog/posts/summary",
+        params={"blog_id": str(uuid.uuid4())},
+    )
+    assert response.status_code == 404
+
+
+def test_read_blog_posts_joins_blog_names(client: TestClient, db: Session) -> None:
+    blog = create_random_blog(db)
+    post = create_random_blog_post(db, blog.id)
+    create_random_blog_post(db, create_random_blog(db).id)
+
+    with capture_selects(engine) as selects:
+        response = client.get(f"{settings.API_V1_STR}/blog/posts/", params={"limit": 5})
+    # The total and the page, blog names come with the page
+    assert len(selects) == 2
+    for data in response.json()["data"]:
+        db_post = db.get(BlogPost, uuid.UUID(data["id"]))
+        assert db_post and db_post.blog
+        assert data["blog_name"] == db_post.blog.name
+
+    with capture_selects(engine) as selects:
+        response = client.get(f"{settings.API_V1_STR}/blog/posts/post/{post.id}")
+    assert len(selects) == 1
+    content = response.json()
+    assert content["blog_name"] == blog.name
+    assert content["content"] == post.content
+
+
+def test_read_blog_post_not_found(client: TestClient) -> None:
+    response = client.get(f"{settings.API_V1_STR}/blog/posts/post/{uuid.uuid4()}")
+    assert response.status_code == 404
+
+
+def test_read_blog_posts_pages_with_cursor(client: TestClient, db: Session) -> None:
+    blog = create_random_blog(db)
+    # Two posts share a timestamp, the id breaks the tie
+    published = [datetime(2025, 3, day) for day in (1, 2, 2, 3, 4)]
+    posts = [
+        create_random_blog_post(db, blog.id, published_at=published_at)
+        for published_at in published
+    ]
+    expected = [
+        str(post.id)
+        for post in sorted(posts, key=lambda p: (p.published_at, p.id), reverse=True)
+    ]
+
+    for path in ("/blog/posts/", "/blog/posts/summary"):
+        seen: list[str] = []
+        params = {"blog_id": str(blog.id), "limit": "2"}
+        while True:
+            response = client.get(f"{settings.API_V1_STR}{path}", params=params)
+            assert response.status_code == 200
+            content = response.json()
+            assert content["count"] == 5
+            seen += [post["id"] for post in content["data"]]
+            if content["next_cursor"] is None:
+                break
+            params["cursor"] = content["next_cursor"]
+        assert seen == expected
+
+
+def test_read_blog_posts_invalid_cursor(client: TestClient) -> None:
+    response = client.get(
+        f"{settings.API_V1_STR}/blog/posts/", params={"cursor": "not-a-cursor"}
+    )
+    assert response.status_code == 400
+
+
+def test_read_blog_posts_count_modes(client: TestClient, db: Session) -> None:
+    blog = create_random_blog(db)
+    create_random_blog_post(db, blog.id)
+    count_cache.clear()
+
+    def count(count_mode: str) -> int:
+        response = client.get(
+            f"{settings.API_V1_STR}/blog/posts/",
+            params={"blog_id": str(blog.id), "count_mode": count_mode},
+        )
+        assert response.status_code == 200
+        total: int = response.json()["count"]
+        return total
+
+    assert count("cached") == 1
+    create_random_blog_post(db, blog.id)
+    assert count("cached") == 1
+    assert count("exact") == 2
+    assert count("estimate") >= 0
+
+
+def test_read_blog_posts_invalid_count_mode(client: TestClient) -> None:
+    response = client.get(
+        f"{settings.API_V1_STR}/blog/posts/", params={"count_mode": "guess"}
+    )
+    assert response.status_code == 422
+
+
+def _post(db: Session, title: str, content: str) -> BlogPost:
+    post = create_random_blog_post(db, create_random_blog(db).id)
+    post.title = title
+    post.content = content
+    db.add(post)
+    db.commit()
+    return post
+
+
+def test_search_blog_posts(client: TestClient, db: Session) -> None:
+    vintage = random_lower_string()
+    in_title = _post(db, f"샤또 마고 {vintage} 입고", "이번 주 신상 와인")
+    in_content = _post(db, "주말 할인", f"샤또 마고 {vintage} 한정 수량")
+    _post(db, "샤또 마고", "다른 빈티지")
+
+    response = client.get(
+        f"{settings.API_V1_STR}/blog/posts/search",
+        params={"q": f"마고 {vintage}", "limit": 1},
+    )
+    assert response.status_code == 200
+    first = response.json()
+    assert [hit["id"] for hit in first["data"]] == [str(in_title.id)]
+    assert first["data"][0]["excerpt"] == "이번 주 신상 와인"
+
+    response = client.get(
+        f"{settings.API_V1_STR}/blog/posts/search",
+        params={"q": f"마고 {vintage}", "limit": 1, "cursor": first["next_cursor"]},
+    )
+    second = response.json()
+    assert [hit["id"] for hit in second["data"]] == [str(in_content.id)]
+    assert second["data"][0]["rank"] < first["data"][0]["rank"]
+    assert second["next_cursor"] is None
+
+
+def test_search_blog_posts_fuzzy_titles(client: TestClient, db: Session) -> None:
+    if not _has_trigram_search(db):
+        pytest.skip("pg_trgm is not installed")
+    post = _post(db, "Chateau Margaux 2015", random_lower_string())
+
+    response = client.get(
+        f"{settings.API_V1_STR}/blog/posts/search", params={"q": "chateau margau"}
+    )
+    assert str(post.id) in [hit["id"] for hit in response.json()["data"]]
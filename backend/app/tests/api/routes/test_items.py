@@ -79,6 +79,18 @@ def test_read_items(
     assert len(content["data"]) >= 2
 
 
+def test_read_items_estimated_count(
+    client: TestClient, normal_user_token_headers: dict[str, str]
+) -> None:
+    response = client.get(
+        f"{settings.API_V1_STR}/items/",
+        headers=normal_user_token_headers,
+        params={"count_mode": "estimate"},
+    )
+    assert response.status_code == 200
+    assert response.json()["count"] >= 0
+
+
 def test_update_item(
     client: TestClient, superuser_token_headers: dict[str, str], db: Session
 ) -> None:
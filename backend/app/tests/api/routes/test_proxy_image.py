@@ -0,0 +1,418 @@
+import asyncio
+import hashlib
+import io
+from collections.abc import AsyncIterator
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+from PIL import Image
+
+from app.api.routes import proxy_image
+from app.core.config import settings
+from app.main import app
+from app.services import image_proxy
+from app.services.image_cache import ImageCache, MemoryImageCache
+
+IMAGE_URL = "https://postfiles.pstatic.net/%EC%99%80%EC%9D%B8.jpg?type=w966"
+IMAGE = bytes(range(256)) * 4096
+LAST_MODIFIED = "Wed, 21 Oct 2015 07:28:00 GMT"
+PHOTO_URL = "https://postfiles.pstatic.net/photo.jpg?type=w966"
+
+
+def _jpeg(width: int, height: int) -> bytes:
+    output = io.BytesIO()
+    Image.new("RGB", (width, height), "purple").save(output, format="jpeg")
+    return output.getvalue()
+
+
+PHOTO = _jpeg(966, 724)
+
+
+async def _chunks(body: bytes, size: int = 8192) -> AsyncIterator[bytes]:
+    for i in range(0, len(body), size):
+        yield body[i : i + size]
+
+
+@pytest.fixture
+def image_host(monkeypatch: pytest.MonkeyPatch) -> list[httpx.Request]:
+    requests: list[httpx.Request] = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        await asyncio.sleep(0.01)
+        body = {
+            "/와인.jpg": IMAGE,
+            "/photo.jpg": PHOTO,
+            "/animation.gif": IMAGE,
+        }.get(request.url.path)
+        if body is None:
+            return httpx.Response(404)
+        if request.headers.get("If-Modified-Since") == LAST_MODIFIED:
+            return httpx.Response(304)
+        headers = {"Content-Type": "image/jpeg", "Last-Modified": LAST_MODIFIED}
+        if request.url.path == "/animation.gif":
+            # Sent chunked, the size is unknown until the end
+            return httpx.Response(200, content=_chunks(body), headers=headers)
+        if "Range" in request.headers:
+            first, last = request.headers["Range"].removeprefix("bytes=").split("-")
+            start, end = int(first), int(last) if last else len(body) - 1
+            return httpx.Response(
+                206,
+                content=_chunks(body[start : end + 1]),
+                headers={
+                    **headers,
+                    "Accept-Ranges": "bytes",
+                    "Content-Range": f"bytes {start}-{end}/{len(body)}",
+                    "Content-Length": str(end - start + 1),
+                },
+            )
+        return httpx.Response(
+            200,
+            content=_chunks(body),
+            headers={**headers, "Content-Length": str(len(body))},
+        )
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(image_proxy, "get_async_client", lambda: client)
+    return requests
+
+
+@pytest.fixture(autouse=True)
+def cache(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> ImageCache:
+    cache = ImageCache(tmp_path, max_bytes=10 * len(IMAGE))
+    monkeypatch.setattr(image_proxy, "image_cache", cache)
+    monkeypatch.setattr(image_proxy, "_oversized_keys", set())
+    monkeypatch.setattr(image_proxy, "_unresizable_keys", set())
+    return cache
+
+
+@pytest.fixture(autouse=True)
+def memory_cache(monkeypatch: pytest.MonkeyPatch) -> MemoryImageCache:
+    memory_cache = MemoryImageCache(
+        max_bytes=10 * len(IMAGE), max_item_bytes=len(IMAGE)
+    )
+    monkeypatch.setattr(image_proxy, "memory_image_cache", memory_cache)
+    monkeypatch.setattr(proxy_image, "memory_image_cache", memory_cache)
+    return memory_cache
+
+
+def test_proxy_image_streams_upstream_body(
+    client: TestClient, image_host: list[httpx.Request]
+) -> None:
+    response = client.get(
+        f"{settings.API_V1_STR}/proxy/image", params={"url": IMAGE_URL}
+    )
+    assert response.status_code == 200
+    assert response.content == IMAGE
+    assert response.headers["content-type"] == "image/jpeg"
+    assert response.headers["content-length"] == str(len(IMAGE))
+    assert response.headers["access-control-allow-origin"] == "*"
+    assert image_host[0].headers["referer"] == "https://blog.naver.com/"
+
+
+def test_proxy_image_upstream_error(
+    client: TestClient, image_host: list[httpx.Request]
+) -> None:
+    response = client.get(
+        f"{settings.API_V1_STR}/proxy/image",
+        params={"url": "https://postfiles.pstatic.net/missing.jpg"},
+    )
+    assert response.status_code == 502
+    assert len(image_host) == 1
+
+
+def test_proxy_image_serves_cached_copy(
+    client: TestClient, image_host: list[httpx.Request], cache: ImageCache
+) -> None:
+    first = client.get(f"{settings.API_V1_STR}/proxy/image", params={"url": IMAGE_URL})
+    assert first.content == IMAGE
+    assert cache.size == len(IMAGE)
+
+    # The same URL with a fragment is the same cache entry
+    second = client.get(
+        f"{settings.API_V1_STR}/proxy/image",
+        params={"url": IMAGE_URL.replace("?type=w966", "?type=w966#top")},
+    )
+    assert second.status_code == 200
+    assert second.content == IMAGE
+    assert second.headers["content-type"] == "image/jpeg"
+    assert second.headers["access-control-allow-origin"] == "*"
+    assert len(image_host) == 1
+
+
+def test_proxy_image_serves_hot_images_from_memory(
+    client: TestClient,
+    superuser_token_headers: dict[str, str],
+    image_host: list[httpx.Request],
+    cache: ImageCache,
+) -> None:
+    for _ in range(3):
+        response = client.get(
+            f"{settings.API_V1_STR}/proxy/image", params={"url": IMAGE_URL}
+        )
+        assert response.content == IMAGE
+    assert len(image_host) == 1
+
+    # Served from memory even once the disk copy is gone
+    cache.clear()
+    response = client.get(
+        f"{settings.API_V1_STR}/proxy/image", params={"url": IMAGE_URL}
+    )
+    assert response.content == IMAGE
+
+    response = client.get(
+        f"{settings.API_V1_STR}/proxy/image/cache-stats",
+        headers=superuser_token_headers,
+    )
+    assert response.status_code == 200
+    assert response.json() == {
+        "hits": 3,
+        "misses": 1,
+        "evictions": 0,
+        "items": 1,
+        "size": len(IMAGE),
+    }
+
+
+def test_proxy_image_coalesces_concurrent_requests(
+    image_host: list[httpx.Request],
+) -> None:
+    async def run() -> list[httpx.Response]:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://test"
+        ) as client:
+            return await asyncio.gather(
+                *(
+                    client.get(
+                        f"{settings.API_V1_STR}/proxy/image", params={"url": IMAGE_URL}
+                    )
+                    for _ in range(10)
+                )
+            )
+
+    responses = asyncio.run(run())
+    assert all(response.content == IMAGE for response in responses)
+    assert len(image_host) == 1
+
+
+def test_proxy_image_conditional_requests(
+    client: TestClient, image_host: list[httpx.Request]
+) -> None:
+    response = client.get(
+        f"{settings.API_V1_STR}/proxy/image", params={"url": IMAGE_URL}
+    )
+    etag = f'"{hashlib.sha256(IMAGE).hexdigest()}"'
+    assert response.headers["etag"] == etag
+    assert response.headers["last-modified"] == LAST_MODIFIED
+    assert response.headers["cache-control"] == "public, max-age=31536000, immutable"
+
+    response = client.get(
+        f"{settings.API_V1_STR}/proxy/image",
+        params={"url": IMAGE_URL},
+        headers={"If-None-Match": f'"other", W/{etag}'},
+    )
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+    assert len(image_host) == 1
+
+
+def test_proxy_image_revalidates_upstream(
+    client: TestClient,
+    image_host: list[httpx.Request],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(settings, "IMAGE_CACHE_REVALIDATE_SECONDS", 0)
+    url = "https://img.example.com/%EC%99%80%EC%9D%B8.jpg"
+
+    for _ in range(2):
+        response = client.get(f"{settings.API_V1_STR}/proxy/image", params={"url": url})
+        assert response.status_code == 200
+        assert response.content == IMAGE
+        assert response.headers["cache-control"] == "public, max-age=0"
+
+    assert "If-Modified-Since" not in image_host[0].headers
+    assert image_host[1].headers["If-Modified-Since"] == LAST_MODIFIED
+
+
+def test_proxy_image_resizes_into_size_buckets(
+    client: TestClient, image_host: list[httpx.Request], cache: ImageCache
+) -> None:
+    response = client.get(
+        f"{settings.API_V1_STR}/proxy/image",
+        params={"url": PHOTO_URL, "w": 200, "h": 200},
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "image/webp"
+    assert len(response.content) < len(PHOTO)
+    with Image.open(io.BytesIO(response.content)) as image:
+        assert image.size == (256, 256)
+
+    # 240 rounds up to the same bucket, the variant is not rendered again
+    same = client.get(
+        f"{settings.API_V1_STR}/proxy/image",
+        params={"url": PHOTO_URL, "w": 240, "h": 240},
+    )
+    assert same.headers["etag"] == response.headers["etag"]
+    assert len(image_host) == 1
+    assert cache.size == len(PHOTO) + len(response.content)
+
+
+@pytest.mark.usefixtures("image_host")
+def test_proxy_image_serves_warm_variants_without_the_original(
+    client: TestClient,
+    cache: ImageCache,
+    memory_cache: MemoryImageCache,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    params = {"url": PHOTO_URL, "w": 384, "h": 384}
+    first = client.get(f"{settings.API_V1_STR}/proxy/image", params=params)
+    assert first.status_code == 200
+
+    disk_reads: list[str] = []
+    monkeypatch.setattr(cache, "get", disk_reads.append)
+    for _ in range(5):
+        response = client.get(f"{settings.API_V1_STR}/proxy/image", params=params)
+        assert response.content == first.content
+    assert disk_reads == []
+    assert memory_cache.stats().hits == 5
+
+
+@pytest.mark.usefixtures("image_host")
+def test_proxy_image_serves_undecodable_images_as_they_are(client: TestClient) -> None:
+    response = client.get(
+        f"{settings.API_V1_STR}/proxy/image",
+        params={"url": IMAGE_URL, "w": 128, "format": "jpeg"},
+    )
+    assert response.status_code == 200
+    assert response.content == IMAGE
+
+
+@pytest.mark.parametrize(
+    ("error", "renders"),
+    [
+        (Image.DecompressionBombError("too many pixels"), 1),
+        # A broken pool may work again, the next request tries once more
+        (BrokenProcessPool(), 2),
+    ],
+)
+@pytest.mark.usefixtures("image_host")
+def test_proxy_image_serves_originals_it_cannot_resize(
+    client: TestClient, monkeypatch: pytest.MonkeyPatch, error: Exception, renders: int
+) -> None:
+    calls: list[object] = []
+
+    def render_thumbnail(*args: object) -> bytes:
+        calls.append(args)
+        raise error
+
+    monkeypatch.setattr(image_proxy, "render_thumbnail", render_thumbnail)
+    monkeypatch.setattr(image_proxy, "get_thumbnail_executor", ThreadPoolExecutor)
+    for _ in range(2):
+        response = client.get(
+            f"{settings.API_V1_STR}/proxy/image", params={"url": PHOTO_URL, "w": 128}
+        )
+        assert response.status_code == 200
+        assert response.content == PHOTO
+    assert len(calls) == renders
+
+
+@pytest.mark.parametrize("in_memory", [True, False])
+@pytest.mark.usefixtures("image_host")
+def test_proxy_image_serves_byte_ranges(
+    client: TestClient, memory_cache: MemoryImageCache, in_memory: bool
+) -> None:
+    if not in_memory:
+        memory_cache.max_item_bytes = 0
+    url = f"{settings.API_V1_STR}/proxy/image"
+    full = client.get(url, params={"url": IMAGE_URL})
+    assert full.headers["accept-ranges"] == "bytes"
+
+    response = client.get(
+        url, params={"url": IMAGE_URL}, headers={"Range": "bytes=1000-199999"}
+    )
+    assert response.status_code == 206
+    assert response.content == IMAGE[1000:200000]
+    assert response.headers["content-range"] == f"bytes 1000-199999/{len(IMAGE)}"
+    assert response.headers["content-length"] == str(199000)
+
+    suffix = client.get(url, params={"url": IMAGE_URL}, headers={"Range": "bytes=-100"})
+    assert suffix.status_code == 206
+    assert suffix.content == IMAGE[-100:]
+
+    beyond = client.get(
+        url, params={"url": IMAGE_URL}, headers={"Range": f"bytes={len(IMAGE)}-"}
+    )
+    assert beyond.status_code == 416
+    assert beyond.headers["content-range"] == f"bytes */{len(IMAGE)}"
+
+    # A client holding another version gets the whole new body
+    changed = client.get(
+        url,
+        params={"url": IMAGE_URL},
+        headers={"Range": "bytes=0-9", "If-Range": '"other"'},
+    )
+    assert changed.status_code == 200
+    assert changed.content == IMAGE
+
+
+def test_proxy_image_caches_small_files_first_requested_by_range(
+    client: TestClient, image_host: list[httpx.Request], cache: ImageCache
+) -> None:
+    response = client.get(
+        f"{settings.API_V1_STR}/proxy/image",
+        params={"url": IMAGE_URL},
+        headers={"Range": "bytes=0-9"},
+    )
+    assert response.status_code == 206
+    assert response.content == IMAGE[:10]
+    # The range tells the size, the whole file is then downloaded once
+    assert [request.headers.get("Range") for request in image_host] == [
+        "bytes=0-9",
+        None,
+    ]
+    assert cache.size == len(IMAGE)
+
+
+def test_proxy_image_passes_large_files_through(
+    client: TestClient,
+    image_host: list[httpx.Request],
+    cache: ImageCache,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(settings, "IMAGE_CACHE_MAX_ITEM_BYTES", 64 * 1024)
+    url = f"{settings.API_V1_STR}/proxy/image"
+
+    response = client.get(
+        url, params={"url": IMAGE_URL}, headers={"Range": "bytes=4096-"}
+    )
+    assert response.status_code == 206
+    assert response.content == IMAGE[4096:]
+    assert response.headers["content-range"] == (
+        f"bytes 4096-{len(IMAGE) - 1}/{len(IMAGE)}"
+    )
+    # The ranged download is passed through as it is, not fetched again
+    [request] = image_host
+    assert request.headers["Range"] == "bytes=4096-"
+
+    response = client.get(url, params={"url": IMAGE_URL})
+    assert response.status_code == 200
+    assert response.content == IMAGE
+    assert len(image_host) == 2
+
+    # Without a Content-Length the download stops once it outgrows the limit
+    # and the rest of the response follows the part already read
+    gif_url = "https://postfiles.pstatic.net/animation.gif"
+    for _ in range(2):
+        response = client.get(url, params={"url": gif_url})
+        assert response.status_code == 200
+        assert response.content == IMAGE
+        assert "content-length" not in response.headers
+    assert len(image_host) == 4
+    assert cache.size == 0
+    assert list(cache.temp_directory.iterdir()) == []
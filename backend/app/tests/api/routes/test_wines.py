@@ -0,0 +1,48 @@
+from datetime import datetime
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from app import crud
+from app.core.config import settings
+from app.models import WineMentionBase
+from app.tests.utils.blog import create_random_blog, create_random_blog_post
+
+
+def test_read_wine_mentions(client: TestClient, db: Session) -> None:
+    blog = create_random_blog(db)
+    old = create_random_blog_post(db, blog.id, published_at=datetime(2024, 1, 1))
+    new = create_random_blog_post(db, blog.id, published_at=datetime(2099, 1, 1))
+    crud.replace_wine_mentions(
+        session=db,
+        blog=blog,
+        mentions={
+            old.post_id: [WineMentionBase(wine="Château Palmer", vintage=2015)],
+            new.post_id: [
+                WineMentionBase(wine="Château Palmer", vintage=2018, price=690_000)
+            ],
+        },
+    )
+
+    response = client.get(
+        f"{settings.API_V1_STR}/wines/mentions",
+        params={"wine": "샤또 팔머", "since": "2098-12-25T00:00:00"},
+    )
+    assert response.status_code == 200
+    content = response.json()
+    assert content["wine"] == "Château Palmer"
+    assert content["count"] == 1
+    [mention] = content["data"]
+    assert mention["blog_post_id"] == str(new.id)
+    assert mention["blog_name"] == blog.name
+    assert mention["title"] == new.title
+    assert mention["vintage"] == 2018
+    assert mention["price"] == 690_000
+
+
+def test_read_wine_mentions_unknown_wine(client: TestClient) -> None:
+    response = client.get(
+        f"{settings.API_V1_STR}/wines/mentions", params={"wine": "margarita"}
+    )
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Wine not found"
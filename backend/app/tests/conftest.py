@@ -9,7 +9,7 @@ from app.core.db import engine, init_db
 from app.main import app
 from app.tests.utils.user import authentication_token_from_email
 from app.tests.utils.utils import get_superuser_token_headers
-from app.models import Item, User
+from app.models import Blog, Item, User
 
 
 @pytest.fixture(scope="session", autouse=True)
@@ -17,6 +17,8 @@ def db() -> Generator[Session, None, None]:
     with Session(engine) as session:
         init_db(session)
         yield session
+        statement = delete(Blog)
+        session.execute(statement)
         statement = delete(Item)
         session.execute(statement)
         statement = delete(User)
@@ -0,0 +1,83 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from app.core.config import settings
+from app.core.http import TokenBucket, request_with_retry
+
+
+@pytest.fixture(autouse=True)
+def fast_backoff(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "HTTP_RETRY_BACKOFF", 0.01)
+    monkeypatch.setattr(settings, "HTTP_RETRY_BACKOFF_MAX", 0.05)
+
+
+def _request(statuses: list[int]) -> tuple[int, int]:
+    """
+    Answer with ``statuses`` in turn, return the final status and attempts made
+    """
+    attempts = 0
+
+    def handler(_: httpx.Request) -> httpx.Response:
+        nonlocal attempts
+        status = statuses[min(attempts, len(statuses) - 1)]
+        attempts += 1
+        return httpx.Response(status, headers={"Retry-After": "0"})
+
+    async def run() -> int:
+        transport = httpx.MockTransport(handler)
+        async with httpx.AsyncClient(transport=transport) as client:
+            response = await request_with_retry(client, "GET", "http://retry.test/")
+            return response.status_code
+
+    try:
+        status = asyncio.run(run())
+    except httpx.HTTPStatusError as e:
+        status = e.response.status_code
+    return status, attempts
+
+
+def test_token_bucket_paces_after_burst() -> None:
+    bucket = TokenBucket(rate=50, capacity=2)
+
+    async def run() -> None:
+        for _ in range(5):
+            await bucket.acquire()
+
+    started = time.monotonic()
+    asyncio.run(run())
+    # Two tokens are free, the other three arrive 20ms apart
+    assert time.monotonic() - started >= 0.05
+
+
+def test_request_with_retry_retries_throttling_and_outages() -> None:
+    assert _request([429, 503, 200]) == (200, 3)
+
+
+def test_request_with_retry_gives_up() -> None:
+    assert _request([502]) == (502, settings.HTTP_RETRY_ATTEMPTS)
+
+
+def test_request_with_retry_does_not_retry_client_errors() -> None:
+    assert _request([404, 200]) == (404, 1)
+
+
+def test_request_with_retry_retries_timeouts() -> None:
+    attempts = 0
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal attempts
+        attempts += 1
+        if attempts == 1:
+            raise httpx.ReadTimeout("timed out", request=request)
+        return httpx.Response(200)
+
+    async def run() -> httpx.Response:
+        transport = httpx.MockTransport(handler)
+        async with httpx.AsyncClient(transport=transport) as client:
+            return await request_with_retry(client, "GET", "http://timeout.test/")
+
+    assert asyncio.run(run()).status_code == 200
+    assert attempts == 2
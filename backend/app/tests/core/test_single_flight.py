@@ -0,0 +1,44 @@
+import asyncio
+
+import pytest
+
+from app.core.single_flight import SingleFlight
+
+
+def test_single_flight_coalesces_concurrent_calls() -> None:
+    calls = 0
+
+    async def fetch() -> str:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return "image"
+
+    async def run() -> list[str]:
+        flight: SingleFlight[str] = SingleFlight()
+        results = await asyncio.gather(*(flight.do("a", fetch) for _ in range(10)))
+        assert len(flight) == 0
+        # Once the first call finished, the next one runs again
+        results.append(await flight.do("a", fetch))
+        return results
+
+    assert asyncio.run(run()) == ["image"] * 11
+    assert calls == 2
+
+
+def test_single_flight_survives_cancelled_waiter() -> None:
+    async def fetch() -> str:
+        await asyncio.sleep(0.01)
+        return "image"
+
+    async def run() -> str:
+        flight: SingleFlight[str] = SingleFlight()
+        first = asyncio.create_task(flight.do("a", fetch))
+        second = asyncio.create_task(flight.do("a", fetch))
+        await asyncio.sleep(0)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+
+    assert asyncio.run(run()) == "image"
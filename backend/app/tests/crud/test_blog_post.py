@@ -0,0 +1,79 @@
+from datetime import datetime
+
+from sqlmodel import Session, select
+
+from app import crud
+from app.models import BlogPost, NaverBlogPost, WineMention, WineMentionBase
+from app.tests.utils.blog import create_random_blog, create_random_blog_post
+
+
+def test_get_blog_post_ids(db: Session) -> None:
+    blog = create_random_blog(db)
+    other_blog = create_random_blog(db)
+    create_random_blog_post(db, blog.id, post_id="100")
+    create_random_blog_post(db, blog.id, post_id="200")
+    create_random_blog_post(db, other_blog.id, post_id="300")
+    post_ids = crud.get_blog_post_ids(session=db, blog_id=blog.id)
+    assert post_ids == {"100", "200"}
+
+
+def test_upsert_blog_posts_is_idempotent(db: Session) -> None:
+    blog = create_random_blog(db)
+    post = NaverBlogPost(
+        title="first",
+        published_at=datetime(2025, 7, 24, 16, 13),
+        content="content",
+        image_urls=["https://postfiles.pstatic.net/a.jpg"],
+    )
+    assert crud.upsert_blog_posts(session=db, blog=blog, posts={"100": post}) == (
+        1,
+        [],
+    )
+
+    updated = post.model_copy(update={"title": "second"})
+    crud.upsert_blog_posts(session=db, blog=blog, posts={"100": updated, "200": post})
+
+    statement = select(BlogPost).where(BlogPost.blog_id == blog.id)
+    db_posts = {db_post.post_id: db_post for db_post in db.exec(statement).all()}
+    assert set(db_posts) == {"100", "200"}
+    db.refresh(db_posts["100"])
+    assert db_posts["100"].title == "second"
+    assert db_posts["100"].url == f"{blog.url}/100"
+    assert db_posts["200"].image_urls == post.image_urls
+
+
+def test_upsert_blog_posts_leaves_invalid_posts_out(db: Session) -> None:
+    blog = create_random_blog(db)
+    post = NaverBlogPost(
+        title="first",
+        published_at=datetime(2025, 7, 24, 16, 13),
+        content="content",
+        image_urls=[],
+    )
+    untitled = post.model_copy(update={"title": ""})
+    created, invalid = crud.upsert_blog_posts(
+        session=db, blog=blog, posts={"100": post, "200": untitled}
+    )
+    assert (created, invalid) == (1, ["200"])
+    assert crud.get_blog_post_ids(session=db, blog_id=blog.id) == {"100"}
+
+
+def test_replace_wine_mentions(db: Session) -> None:
+    blog = create_random_blog(db)
+    post = create_random_blog_post(db, blog.id, post_id="100")
+    first = [WineMentionBase(wine="Krug", vintage=2008)]
+    crud.replace_wine_mentions(session=db, blog=blog, mentions={"100": first})
+
+    second = [WineMentionBase(wine="Opus One"), WineMentionBase(wine="Krug")]
+    created = crud.replace_wine_mentions(
+        session=db, blog=blog, mentions={"100": second, "999": first}
+    )
+    assert created == 2
+
+    statement = select(WineMention).where(WineMention.blog_post_id == post.id)
+    mentions = db.exec(statement).all()
+    assert {(m.wine, m.vintage) for m in mentions} == {
+        ("Opus One", None),
+        ("Krug", None),
+    }
+    assert all(m.published_at == post.published_at for m in mentions)
@@ -0,0 +1,97 @@
+from collections.abc import Callable
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session, text
+
+from app import crud
+from app.core.config import settings
+from app.core.db import engine
+from app.models import Blog, BlogPost
+from app.tests.utils.blog import create_random_blog
+from app.tests.utils.query_plan import capture_selects, unindexed_scans
+from app.tests.utils.utils import random_lower_string
+
+
+@pytest.fixture(scope="module")
+def seeded_blog(db: Session) -> Blog:
+    """
+    A blog among several, so the planner sees a realistic blog_id selectivity
+    """
+    blogs = [create_random_blog(db) for _ in range(10)]
+    start = datetime(2025, 1, 1)
+    db.add_all(
+        BlogPost(
+            blog_id=blog.id,
+            url=f"{blog.url}/{day}",
+            post_id=str(day),
+            title=random_lower_string(),
+            published_at=start + timedelta(days=day, minutes=i),
+            content=random_lower_string(),
+        )
+        for i, blog in enumerate(blogs)
+        for day in range(30)
+    )
+    db.commit()
+    db.exec(text("ANALYZE blog"))  # type: ignore[call-overload]
+    db.exec(text("ANALYZE blogpost"))  # type: ignore[call-overload]
+    return blogs[0]
+
+
+def _page_cursor(client: TestClient, path: str) -> str:
+    response = client.get(f"{settings.API_V1_STR}{path}", params={"limit": 5})
+    cursor: str = response.json()["next_cursor"]
+    return cursor
+
+
+HOT_QUERIES: dict[
+    str, Callable[[TestClient, Session, Blog, dict[str, str]], object]
+] = {
+    "latest posts": lambda client, _db, _blog, _headers: client.get(
+        f"{settings.API_V1_STR}/blog/posts/",
+        params={"cursor": _page_cursor(client, "/blog/posts/")},
+    ),
+    "posts of a blog": lambda client, _db, blog, _headers: client.get(
+        f"{settings.API_V1_STR}/blog/posts/",
+        params={
+            "blog_id": str(blog.id),
+            "cursor": _page_cursor(client, f"/blog/posts/?blog_id={blog.id}"),
+        },
+    ),
+    "post summaries of a blog": lambda client, _db, blog, _headers: client.get(
+        f"{settings.API_V1_STR}/blog/posts/summary",
+        params={"blog_id": str(blog.id), "limit": 5},
+    ),
+    "post search": lambda client, _db, _blog, _headers: client.get(
+        f"{settings.API_V1_STR}/blog/posts/search", params={"q": "와인"}
+    ),
+    "post by id": lambda client, _db, blog, _headers: client.get(
+        f"{settings.API_V1_STR}/blog/posts/post/{blog.posts[0].id}"
+    ),
+    "mentions of a wine": lambda client, _db, _blog, _headers: client.get(
+        f"{settings.API_V1_STR}/wines/mentions",
+        params={"wine": "샤또 마고", "since": "2025-01-15T00:00:00"},
+    ),
+    "items of a user": lambda client, _db, _blog, headers: client.get(
+        f"{settings.API_V1_STR}/items/", headers=headers
+    ),
+    "known post ids": lambda _client, db, blog, _headers: crud.get_blog_post_ids(
+        session=db, blog_id=blog.id
+    ),
+}
+
+
+@pytest.mark.parametrize("name", HOT_QUERIES)
+def test_hot_queries_use_indexes(
+    client: TestClient,
+    db: Session,
+    seeded_blog: Blog,
+    normal_user_token_headers: dict[str, str],
+    name: str,
+) -> None:
+    with capture_selects(engine) as selects:
+        HOT_QUERIES[name](client, db, seeded_blog, normal_user_token_headers)
+    assert selects
+    for statement, parameters in selects:
+        assert unindexed_scans(engine, statement, parameters) == [], statement
@@ -0,0 +1,226 @@
+import asyncio
+import io
+from collections.abc import Container
+from pathlib import Path
+
+import httpx
+import pytest
+from PIL import Image
+from sqlmodel import Session, col, select
+
+from app import crud
+from app.core.config import settings
+from app.models import Blog, BlogPost, WineMention
+from app.services import blog_crawler, image_proxy
+from app.services.blog_crawler import CrawlResult, crawl_blog
+from app.services.category_cache import category_cache
+from app.services.image_cache import ImageCache, normalize_image_url
+from app.services.image_proxy import ImagePrefetcher
+from app.tests.utils.blog import create_random_blog
+from app.tests.utils.naver import fake_naver_transport, post_view_html
+
+OLD_LAYOUT_HTML = '<html><body><div id="postViewArea">와인</div></body></html>'
+
+
+@pytest.fixture(autouse=True)
+def no_retries(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "HTTP_RETRY_ATTEMPTS", 1)
+
+
+def _crawl(
+    blog: Blog,
+    post_ids: list[str],
+    calls: list[str] | None = None,
+    failing_ids: Container[str] = (),
+    old_layout_ids: Container[str] = (),
+    untitled_ids: Container[str] = (),
+) -> CrawlResult:
+    """
+    :param failing_ids: Posts whose PostView.nhn answers 503
+    :param old_layout_ids: Posts written with the old editor, which the
+        parser cannot read
+    :param untitled_ids: Posts without a title, which cannot be stored
+    """
+    naver = fake_naver_transport(post_ids, calls)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        post_id = request.url.params.get("logNo")
+        if post_id in failing_ids:
+            return httpx.Response(503)
+        if post_id in old_layout_ids:
+            return httpx.Response(200, text=OLD_LAYOUT_HTML)
+        if post_id in untitled_ids:
+            return httpx.Response(200, text=post_view_html(post_id, title=""))
+        return naver.handle_request(request)
+
+    async def run() -> CrawlResult:
+        transport = httpx.MockTransport(handler)
+        async with httpx.AsyncClient(transport=transport) as client:
+            return await crawl_blog(blog, client=client)
+
+    return asyncio.run(run())
+
+
+def test_crawl_blog_is_incremental(db: Session) -> None:
+    blog = create_random_blog(db)
+
+    result = _crawl(blog, ["200", "100"])
+    assert result.created == 2
+    db.refresh(blog)
+    assert blog.last_post_id == "200"
+    assert blog.last_crawled_at is not None
+    assert blog.first_page_hash is not None
+
+    result = _crawl(blog, ["200", "100"])
+    assert result.skipped
+    assert result.created == 0
+
+    result = _crawl(blog, ["300", "200", "100"])
+    assert result.created == 1
+    db.refresh(blog)
+    assert blog.last_post_id == "300"
+    assert crud.get_blog_post_ids(session=db, blog_id=blog.id) == {"100", "200", "300"}
+
+
+def test_crawl_blog_retries_failed_posts(db: Session) -> None:
+    blog = create_random_blog(db)
+    _crawl(blog, ["200", "100"])
+    db.refresh(blog)
+
+    result = _crawl(blog, ["400", "300", "200", "100"], failing_ids={"300"})
+    assert (result.created, result.failed) == (1, 1)
+    db.refresh(blog)
+    assert blog.last_post_id == "200"
+
+    result = _crawl(blog, ["400", "300", "200", "100"])
+    assert (result.created, result.failed) == (1, 0)
+    db.refresh(blog)
+    assert blog.last_post_id == "400"
+    assert crud.get_blog_post_ids(session=db, blog_id=blog.id) == {
+        "100",
+        "200",
+        "300",
+        "400",
+    }
+    assert _crawl(blog, ["400", "300", "200", "100"]).skipped
+
+
+def test_crawl_blog_skips_posts_it_cannot_store(db: Session) -> None:
+    blog = create_random_blog(db)
+    _crawl(blog, ["200", "100"])
+    db.refresh(blog)
+
+    # A post that can never be parsed does not hold the watermark back
+    result = _crawl(blog, ["400", "300", "200", "100"], old_layout_ids={"300"})
+    assert (result.created, result.failed) == (1, 1)
+    db.refresh(blog)
+    assert blog.last_post_id == "400"
+    assert blog.skipped_post_ids == ["300"]
+    assert _crawl(blog, ["400", "300", "200", "100"]).skipped
+
+    # Nor is it fetched again while a temporary failure holds the watermark
+    calls: list[str] = []
+    post_ids = ["600", "500", "400", "300", "200", "100"]
+    result = _crawl(blog, post_ids, old_layout_ids={"500"}, failing_ids={"600"})
+    assert (result.created, result.failed) == (0, 2)
+    db.refresh(blog)
+    assert blog.last_post_id == "400"
+    assert blog.skipped_post_ids == ["300", "500"]
+    result = _crawl(blog, post_ids, calls)
+    assert (result.created, result.failed) == (1, 0)
+    assert calls.count("/PostView.nhn") == 1
+    db.refresh(blog)
+    assert blog.last_post_id == "600"
+
+
+def test_crawl_blog_keeps_posts_of_a_failed_first_crawl(db: Session) -> None:
+    blog = create_random_blog(db)
+    result = _crawl(blog, ["200", "100"], failing_ids={"200", "100"})
+    assert (result.created, result.failed) == (0, 2)
+
+    db.refresh(blog)
+    result = _crawl(blog, ["200", "100"])
+    assert result.created == 2
+
+
+def test_crawl_blog_stores_the_valid_posts_of_a_batch(db: Session) -> None:
+    blog = create_random_blog(db)
+    result = _crawl(blog, ["300", "200", "100"], untitled_ids={"200"})
+    assert (result.created, result.failed) == (2, 1)
+    assert crud.get_blog_post_ids(session=db, blog_id=blog.id) == {"100", "300"}
+    db.refresh(blog)
+    assert blog.last_post_id == "300"
+    assert blog.skipped_post_ids == ["200"]
+
+
+def test_crawl_blog_extracts_wine_mentions(db: Session) -> None:
+    blog = create_random_blog(db)
+    _crawl(blog, ["100"])
+
+    statement = (
+        select(WineMention)
+        .join(BlogPost, col(BlogPost.id) == WineMention.blog_post_id)
+        .where(BlogPost.blog_id == blog.id)
+    )
+    [mention] = db.exec(statement).all()
+    assert mention.wine == "Château Margaux"
+    assert mention.vintage == 2015
+
+
+def test_crawl_blog_persists_categories(db: Session) -> None:
+    blog = create_random_blog(db)
+    _crawl(blog, ["100"])
+    db.refresh(blog)
+    assert blog.categories == {"와인소식": [7, 1], "전체글": [0, None]}
+    assert blog.categories_updated_at is not None
+
+    category_cache.clear()
+    calls: list[str] = []
+    _crawl(blog, ["200", "100"], calls)
+    assert "/rego/CategoryList.nhn" not in calls
+
+
+def test_crawl_blog_prefetches_images(
+    db: Session, monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    photo = io.BytesIO()
+    Image.new("RGB", (966, 724), "purple").save(photo, format="jpeg")
+    image_requests: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        image_requests.append(str(request.url))
+        return httpx.Response(
+            200, content=photo.getvalue(), headers={"Content-Type": "image/jpeg"}
+        )
+
+    image_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    cache = ImageCache(tmp_path, max_bytes=10 * 1024 * 1024)
+    monkeypatch.setattr(image_proxy, "get_async_client", lambda: image_client)
+    monkeypatch.setattr(image_proxy, "image_cache", cache)
+    monkeypatch.setattr(settings, "IMAGE_PREFETCH_ENABLED", True)
+    prefetcher = ImagePrefetcher(concurrency=2, max_queued=10)
+    monkeypatch.setattr(blog_crawler, "image_prefetcher", prefetcher)
+    blog = create_random_blog(db)
+
+    async def run() -> CrawlResult:
+        transport = fake_naver_transport(["200", "100"])
+        async with httpx.AsyncClient(transport=transport) as client:
+            result = await crawl_blog(blog, client=client)
+            # The crawl only queues the images, the workers fetch them after it
+            assert image_requests == []
+        await prefetcher.join()
+        await prefetcher.shutdown()
+        return result
+
+    result = asyncio.run(run())
+    assert result.created == 2
+    # Both posts share the same two images
+    assert result.images_queued == 2
+    assert sorted(map(normalize_image_url, image_requests)) == [
+        "https://postfiles.pstatic.net/a.jpg?type=w966",
+        "https://postfiles.pstatic.net/b.jpg",
+    ]
+    for url in image_requests:
+        key = ImageCache.key(url)
+        assert cache.get(key) is not None
+        assert cache.get(ImageCache.variant_key(key, "384x384.webp")) is not None
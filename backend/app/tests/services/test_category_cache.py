@@ -0,0 +1,43 @@
+import asyncio
+import time
+
+import httpx
+
+from app.services.category_cache import CategoryCache, category_cache
+from app.services.naver_blog_service import AsyncNaverBlogSerivce
+from app.tests.utils.naver import NAVER_BLOG_ID, fake_naver_transport
+
+
+def test_category_cache_expires() -> None:
+    cache = CategoryCache(ttl_seconds=60)
+    cache.set("a", {"전체글": (0, None)})
+    assert cache.get("a") == {"전체글": (0, None)}
+    cache.set("b", {"전체글": (0, None)}, fetched_at=time.time() - 61)
+    assert cache.get("b") is None
+    assert cache.get("missing") is None
+
+
+def test_service_reuses_cached_categories() -> None:
+    category_cache.clear()
+    calls: list[str] = []
+
+    async def run() -> None:
+        transport = fake_naver_transport(["100"], calls)
+        async with httpx.AsyncClient(transport=transport) as client:
+            for _ in range(3):
+                service = AsyncNaverBlogSerivce(NAVER_BLOG_ID, client=client)
+                await service.get_post_id_page("와인소식")
+
+    asyncio.run(run())
+    assert calls.count("/rego/CategoryList.nhn") == 1
+    assert calls.count("/PostTitleListAsync.nhn") == 3
+
+
+def test_lazy_service_construction_has_no_network_call() -> None:
+    calls: list[str] = []
+    AsyncNaverBlogSerivce(
+        NAVER_BLOG_ID,
+        client=httpx.AsyncClient(transport=fake_naver_transport([], calls)),
+        categories={"전체글": (0, None)},
+    )
+    assert calls == []
@@ -0,0 +1,39 @@
+import asyncio
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+from app.core.config import settings
+from app.services.crawl_scheduler import CrawlScheduler
+
+
+def test_only_one_scheduler_drives_crawling() -> None:
+    leader = CrawlScheduler()
+    follower = CrawlScheduler()
+    try:
+        assert leader._acquire_leadership()
+        assert not follower._acquire_leadership()
+        with patch("app.services.crawl_scheduler.crawl_blog") as crawl_blog:
+            assert asyncio.run(follower.run()) == []
+            crawl_blog.assert_not_called()
+
+        leader.shutdown()
+        assert follower._acquire_leadership()
+    finally:
+        leader.shutdown()
+        follower.shutdown()
+
+
+def test_first_crawl_runs_soon_after_start() -> None:
+    async def first_run() -> datetime:
+        scheduler = CrawlScheduler()
+        scheduler.start()
+        try:
+            [job] = scheduler._scheduler.get_jobs()
+            next_run: datetime = job.next_run_time
+            return next_run
+        finally:
+            scheduler.shutdown()
+
+    started = datetime.now().astimezone()
+    latest = started + timedelta(seconds=settings.CRAWL_JITTER_SECONDS + 1)
+    assert started <= asyncio.run(first_run()) <= latest
@@ -0,0 +1,102 @@
+import os
+import time
+from pathlib import Path
+
+from app.services.image_cache import (
+    TEMP_FILE_MAX_AGE_SECONDS,
+    ImageCache,
+    MemoryImage,
+    MemoryImageCache,
+    normalize_image_url,
+)
+
+
+def _put(cache: ImageCache, url: str, body: bytes) -> None:
+    cache.put(ImageCache.key(url), body, "image/png")
+
+
+def _memory_image(body: bytes) -> MemoryImage:
+    return MemoryImage(content_type="image/png", etag="etag", body=body)
+
+
+def test_normalize_image_url() -> None:
+    assert (
+        normalize_image_url("HTTPS://PostFiles.pstatic.net/와인.jpg?type=w966&b=1#x")
+        == "https://postfiles.pstatic.net/%EC%99%80%EC%9D%B8.jpg?b=1&type=w966"
+    )
+
+
+def test_image_cache_evicts_least_recently_used(tmp_path: Path) -> None:
+    cache = ImageCache(tmp_path, max_bytes=25, eviction_grace_seconds=0)
+    _put(cache, "http://img.test/a", b"a" * 10)
+    _put(cache, "http://img.test/b", b"b" * 10)
+    assert cache.get(ImageCache.key("http://img.test/a")) is not None
+    _put(cache, "http://img.test/c", b"c" * 10)
+
+    assert cache.size == 20
+    assert cache.get(ImageCache.key("http://img.test/b")) is None
+    image = cache.get(ImageCache.key("http://img.test/a"))
+    assert image is not None
+    assert image.path.read_bytes() == b"a" * 10
+    assert image.content_type == "image/png"
+
+
+def test_image_cache_keeps_recently_read_images(tmp_path: Path) -> None:
+    cache = ImageCache(tmp_path, max_bytes=15)
+    _put(cache, "http://img.test/a", b"a" * 10)
+    _put(cache, "http://img.test/b", b"b" * 10)
+
+    # Both may still be in flight to a client, the cache overshoots instead
+    assert cache.get(ImageCache.key("http://img.test/a")) is not None
+    assert cache.size == 20
+
+
+def test_image_cache_is_shared_between_processes(tmp_path: Path) -> None:
+    first = ImageCache(tmp_path, max_bytes=25, eviction_grace_seconds=0)
+    second = ImageCache(tmp_path, max_bytes=25, eviction_grace_seconds=0)
+
+    # A download in flight in one worker survives the other starting up
+    with first.writer("in-flight", "image/png") as writer:
+        writer.write(b"x" * 10)
+        second.sweep()
+        assert writer.commit() is not None
+
+    _put(second, "http://img.test/a", b"a" * 10)
+    assert first.get(ImageCache.key("http://img.test/a")) is not None
+
+    # The periodic sweep counts what every worker wrote
+    _put(second, "http://img.test/b", b"b" * 10)
+    assert second.sweep() == 1
+    assert first.get("in-flight") is None
+    assert first.get(ImageCache.key("http://img.test/a")) is not None
+
+
+def test_image_cache_sweeps_dead_partial_downloads(tmp_path: Path) -> None:
+    cache = ImageCache(tmp_path, max_bytes=100)
+    _put(cache, "http://img.test/a", b"a" * 10)
+    cache.temp_directory.joinpath("fresh").write_bytes(b"still downloading")
+    stale = cache.temp_directory / "stale"
+    stale.write_bytes(b"never committed")
+    old = time.time() - TEMP_FILE_MAX_AGE_SECONDS - 1
+    os.utime(stale, (old, old))
+
+    cache = ImageCache(tmp_path, max_bytes=100)
+    assert cache.sweep() == 0
+    assert cache.size == 10
+    assert cache.get(ImageCache.key("http://img.test/a")) is not None
+    assert [path.name for path in cache.temp_directory.iterdir()] == ["fresh"]
+
+
+def test_memory_image_cache_counters() -> None:
+    cache = MemoryImageCache(max_bytes=25, max_item_bytes=12)
+    cache.set("a", _memory_image(b"a" * 10))
+    cache.set("b", _memory_image(b"b" * 10))
+    cache.set("large", _memory_image(b"l" * 20))
+    assert cache.get("a") is not None
+    cache.set("c", _memory_image(b"c" * 10))
+
+    assert cache.get("b") is None
+    assert cache.get("large") is None
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.evictions) == (1, 2, 1)
+    assert (stats.items, stats.size) == (2, 20)
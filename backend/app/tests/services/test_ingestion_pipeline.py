@@ -0,0 +1,40 @@
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import httpx
+
+from app.services.ingestion_pipeline import fetch_and_parse
+from app.services.naver_blog_service import AsyncNaverBlogSerivce, PostFetchResult
+from app.tests.utils.naver import NAVER_BLOG_ID, fake_naver_transport
+
+
+def test_fetch_and_parse_in_process_pool() -> None:
+    post_ids = [str(i) for i in range(100, 140)]
+
+    async def run(executor: ProcessPoolExecutor) -> list[PostFetchResult]:
+        transport = fake_naver_transport(post_ids)
+        async with httpx.AsyncClient(transport=transport) as client:
+            service = AsyncNaverBlogSerivce(NAVER_BLOG_ID, client=client)
+            return [
+                result
+                async for result in fetch_and_parse(
+                    service,
+                    [*post_ids, "missing"],
+                    executor=executor,
+                    parse_concurrency=2,
+                    queue_size=4,
+                )
+            ]
+
+    with ProcessPoolExecutor(
+        max_workers=2, mp_context=multiprocessing.get_context("spawn")
+    ) as executor:
+        results = {result.post_id: result for result in asyncio.run(run(executor))}
+
+    assert set(results) == {*post_ids, "missing"}
+    assert all(results[post_id].post is not None for post_id in post_ids)
+    post = results["100"].post
+    assert post is not None
+    assert post.title == "이번 주 와인"
+    assert isinstance(results["missing"].error, httpx.HTTPStatusError)
@@ -0,0 +1,133 @@
+import asyncio
+import time
+from datetime import datetime
+
+import httpx
+
+from app.models import NaverBlogPost
+from app.services.naver_blog_service import (
+    AsyncNaverBlogSerivce,
+    NaverBlogSerivce,
+    PostFetchResult,
+)
+from app.tests.utils.naver import NAVER_BLOG_ID, fake_naver_transport
+
+
+def test_async_service_load_categories() -> None:
+    async def run() -> AsyncNaverBlogSerivce:
+        async with httpx.AsyncClient(transport=fake_naver_transport([])) as client:
+            service = AsyncNaverBlogSerivce(NAVER_BLOG_ID, client=client)
+            await service.load_categories()
+            return service
+
+    service = asyncio.run(run())
+    assert service.categories == {"와인소식": (7, 1), "전체글": (0, None)}
+
+
+def test_async_service_get_post_ids_and_contents() -> None:
+    async def run() -> tuple[list[str], list[NaverBlogPost | None]]:
+        transport = fake_naver_transport(["300", "200", "100"])
+        async with httpx.AsyncClient(transport=transport) as client:
+            service = AsyncNaverBlogSerivce(NAVER_BLOG_ID, client=client)
+            await service.load_categories()
+            post_ids = await service.get_post_ids("와인소식", 2)
+            posts = [await service.get_contents(post_id) for post_id in post_ids]
+            return post_ids, posts
+
+    post_ids, posts = asyncio.run(run())
+    assert post_ids == ["200", "300"]
+    post = posts[0]
+    assert post is not None
+    assert post.title == "이번 주 와인"
+    assert post.published_at == datetime(2025, 7, 24, 16, 13)
+    assert post.content == "샤또 마고 2015 입고"
+    assert post.image_urls == [
+        "https://postfiles.pstatic.net/a.jpg?type=w966",
+        "https://postfiles.pstatic.net/b.jpg",
+    ]
+
+
+def test_async_service_get_contents_many_reports_failures() -> None:
+    async def run() -> list[PostFetchResult]:
+        transport = fake_naver_transport(["300", "200", "100"])
+        async with httpx.AsyncClient(transport=transport) as client:
+            service = AsyncNaverBlogSerivce(NAVER_BLOG_ID, client=client)
+            return [
+                result
+                async for result in service.get_contents_many(
+                    ["100", "missing", "300"], concurrency=2
+                )
+            ]
+
+    results = {result.post_id: result for result in asyncio.run(run())}
+    assert set(results) == {"100", "missing", "300"}
+    assert results["100"].post is not None
+    assert results["300"].post is not None
+    assert results["missing"].post is None
+    assert isinstance(results["missing"].error, httpx.HTTPStatusError)
+
+
+def test_async_service_get_post_ids_pages_until_known_id() -> None:
+    async def run() -> tuple[list[str], list[str]]:
+        post_ids = [str(i) for i in range(120, 100, -1)]
+        async with httpx.AsyncClient(
+            transport=fake_naver_transport(post_ids)
+        ) as client:
+            service = AsyncNaverBlogSerivce(NAVER_BLOG_ID, client=client)
+            await service.load_categories()
+            everything = await service.get_post_ids("전체글", None, page_size=5)
+            new = await service.get_post_ids(
+                "전체글", None, known_ids={"108", "107"}, page_size=5
+            )
+            return everything, new
+
+    everything, new = asyncio.run(run())
+    assert everything == [str(i) for i in range(101, 121)]
+    assert new == [str(i) for i in range(109, 121)]
+
+
+def test_sync_service_runs_on_the_background_loop() -> None:
+    calls: list[str] = []
+    client = httpx.AsyncClient(
+        transport=fake_naver_transport(["300", "200", "100"], calls)
+    )
+
+    lazy = NaverBlogSerivce(NAVER_BLOG_ID, lazy=True, client=client)
+    assert calls == []
+    assert lazy.category_names() == ["와인소식", "전체글"]
+
+    service = NaverBlogSerivce(NAVER_BLOG_ID, client=client)
+    assert service.categories == {"와인소식": (7, 1), "전체글": (0, None)}
+    post_ids = service.get_post_ids("와인소식", None)
+    assert post_ids == ["100", "200", "300"]
+    post = service.get_contents("300")
+    assert post is not None
+    assert post.title == "이번 주 와인"
+
+    results = service.get_contents_many(["100", "missing", "300"], concurrency=1)
+    assert {result.post_id: result.post is None for result in results} == {
+        "100": False,
+        "missing": True,
+        "300": False,
+    }
+
+
+def test_sync_service_get_contents_many_closes_early() -> None:
+    naver = fake_naver_transport(["300", "200", "100"])
+    served: list[str] = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(0.05)
+        served.append(request.url.params["logNo"])
+        return naver.handle_request(request)
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    service = NaverBlogSerivce(NAVER_BLOG_ID, lazy=True, client=client)
+
+    results = service.get_contents_many(["300", "200", "100"], concurrency=1)
+    first = next(results)
+    assert first.post is not None
+    # Closing the generator cancels the fetches still in flight
+    results.close()
+    time.sleep(0.2)
+    assert served == [first.post_id]
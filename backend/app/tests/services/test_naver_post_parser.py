@@ -0,0 +1,36 @@
+from pathlib import Path
+
+import pytest
+
+from app.services.naver_post_parser import PARSERS
+from app.tests.utils.naver import post_view_html
+
+FIXTURE = Path(__file__).parent.parent / "fixtures" / "naver_post_view.html"
+
+
+@pytest.mark.parametrize(
+    "html, post_id",
+    [
+        (FIXTURE.read_text(), "223912345678"),
+        (post_view_html("100"), "100"),
+    ],
+)
+def test_parser_engines_agree(html: str, post_id: str) -> None:
+    posts = {engine: parse(html, post_id) for engine, parse in PARSERS.items()}
+    assert posts["lxml"] is not None
+    assert posts["lxml"] == posts["html.parser"]
+
+
+def test_lxml_parser_extracts_post() -> None:
+    post = PARSERS["lxml"](FIXTURE.read_text(), "223912345678")
+    assert post is not None
+    assert post.title == "이번 주 입고 와인 안내 (샤또 마고 2015 포함)"
+    assert post.published_at is not None
+    assert len(post.image_urls) == 15
+    assert all(url.endswith("?type=w966") for url in post.image_urls)
+    assert "var " not in post.content
+
+
+def test_parser_engines_missing_post() -> None:
+    for parse in PARSERS.values():
+        assert parse(post_view_html("100"), "200") is None
@@ -0,0 +1,50 @@
+import io
+
+from PIL import Image
+
+from app.services.thumbnails import render_thumbnail, snap_size
+
+
+def _png(width: int, height: int, mode: str = "RGB") -> bytes:
+    output = io.BytesIO()
+    Image.new(mode, (width, height), (255, 0, 0, 128)).save(output, format="png")
+    return output.getvalue()
+
+
+def test_snap_size() -> None:
+    assert snap_size(None) is None
+    assert snap_size(1) == 64
+    assert snap_size(256) == 256
+    assert snap_size(300) == 384
+    assert snap_size(5000) == 1024
+
+
+def test_render_thumbnail_crops_to_box() -> None:
+    body = render_thumbnail(_png(800, 600), 256, 256, "webp")
+    assert body is not None
+    with Image.open(io.BytesIO(body)) as image:
+        assert image.format == "WEBP"
+        assert image.size == (256, 256)
+
+
+def test_render_thumbnail_keeps_aspect_ratio() -> None:
+    body = render_thumbnail(_png(800, 600), 400, None, "jpeg")
+    assert body is not None
+    with Image.open(io.BytesIO(body)) as image:
+        assert image.format == "JPEG"
+        assert image.size == (400, 300)
+
+
+def test_render_thumbnail_never_enlarges() -> None:
+    body = render_thumbnail(_png(100, 50, "RGBA"), 256, 256, "webp")
+    assert body is not None
+    with Image.open(io.BytesIO(body)) as image:
+        assert image.size == (100, 50)
+        assert image.mode == "RGBA"
+
+
+def test_render_thumbnail_skips_animated_images() -> None:
+    frames = [Image.new("RGB", (800, 600), color) for color in ("red", "blue")]
+    output = io.BytesIO()
+    frames[0].save(output, format="gif", save_all=True, append_images=frames[1:])
+    assert render_thumbnail(output.getvalue(), 256, 256, "webp") is None
@@ -0,0 +1,45 @@
+from app.models import WineMentionBase
+from app.services.wine_extractor import AhoCorasick, WineExtractor, get_wine_extractor
+
+
+def test_aho_corasick_finds_overlapping_patterns() -> None:
+    matcher = AhoCorasick([("he", 1), ("she", 2), ("his", 3), ("hers", 4)])
+    assert sorted(matcher.iter_matches("ushers")) == [(1, 4, 2), (2, 4, 1), (2, 6, 4)]
+
+
+def test_extract_names_vintages_and_prices() -> None:
+    text = (
+        "이번 주 샤또 마고 2015 ₩1,250,000 입고!\n"
+        "Opus One 2019 89만원, Château Latour 2010 — 2,100,000원"
+    )
+    assert get_wine_extractor().extract(text) == [
+        WineMentionBase(wine="Château Margaux", vintage=2015, price=1_250_000),
+        WineMentionBase(wine="Opus One", vintage=2019, price=890_000),
+        WineMentionBase(wine="Château Latour", vintage=2010, price=2_100_000),
+    ]
+
+
+def test_extract_prefers_the_longest_alias() -> None:
+    extractor = WineExtractor({"Penfolds": "Penfolds", "Penfolds Grange": "Grange"})
+    assert extractor.extract("penfolds grange 8.5만원") == [
+        WineMentionBase(wine="Grange", price=85_000)
+    ]
+
+
+def test_extract_skips_partial_words_and_repeats() -> None:
+    extractor = WineExtractor({"Krug": "Krug"})
+    assert extractor.extract("Krugerrand") == []
+    text = "KRUG 2008, 다시 한번 krug 2008"
+    assert extractor.extract(text) == [WineMentionBase(wine="Krug", vintage=2008)]
+
+
+def test_extract_ignores_numbers_that_are_not_vintages_or_prices() -> None:
+    extractor = WineExtractor({"Krug": "Krug"})
+    assert extractor.extract("Krug 750ml 12,015 20원") == [WineMentionBase(wine="Krug")]
+
+
+def test_canonical_name() -> None:
+    extractor = get_wine_extractor()
+    assert extractor.canonical_name(" chateau margaux ") == "Château Margaux"
+    assert extractor.canonical_name("샤또마고") == "Château Margaux"
+    assert extractor.canonical_name("margarita") is None
@@ -0,0 +1,42 @@
+import uuid
+from datetime import datetime
+
+from sqlmodel import Session
+
+from app.models import Blog, BlogPost
+from app.tests.utils.utils import random_lower_string
+
+
+def create_random_blog(db: Session) -> Blog:
+    blog_owner = random_lower_string()
+    blog = Blog(
+        name=random_lower_string(),
+        url=f"https://blog.naver.com/{blog_owner}",
+        blog_owner=blog_owner,
+    )
+    db.add(blog)
+    db.commit()
+    db.refresh(blog)
+    return blog
+
+
+def create_random_blog_post(
+    db: Session,
+    blog_id: uuid.UUID,
+    post_id: str | None = None,
+    published_at: datetime | None = None,
+) -> BlogPost:
+    post_id = post_id or str(uuid.uuid4().int)[:12]
+    blog_post = BlogPost(
+        blog_id=blog_id,
+        url=f"https://blog.naver.com/{blog_id}/{post_id}",
+        post_id=post_id,
+        title=random_lower_string(),
+        published_at=published_at or datetime.now(),
+        content=random_lower_string(),
+        image_urls=[],
+    )
+    db.add(blog_post)
+    db.commit()
+    db.refresh(blog_post)
+    return blog_post
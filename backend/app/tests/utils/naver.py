@@ -0,0 +1,77 @@
+import json
+
+import httpx
+
+NAVER_BLOG_ID = "winetest"
+
+
+def category_list_response() -> str:
+    data = {
+        "result": {
+            "mylogCategoryList": [
+                {
+                    "categoryName": "와인\xa0소식",
+                    "categoryNo": 7,
+                    "parentCategoryNo": 1,
+                    "divisionLine": False,
+                },
+                {
+                    "categoryName": "",
+                    "categoryNo": 0,
+                    "parentCategoryNo": None,
+                    "divisionLine": True,
+                },
+            ]
+        }
+    }
+    return ")]}',\n" + json.dumps(data)
+
+
+def post_view_html(post_id: str, title: str = "이번 주 와인") -> str:
+    return f"""
+    <html><body>
+    <div id="post-view{post_id}"><div>
+      <div class="se-documentTitle">
+        <span class="se-title-text">{title}</span>
+        <span class="se_publishDate">2025. 7. 24. 16:13</span>
+      </div>
+      <div class="se-main-container">
+        <p>샤또 마고 2015&nbsp;입고</p>
+        <img src="https://postfiles.pstatic.net/a.jpg?type=w80_blur" />
+        <img src="https://postfiles.pstatic.net/b.jpg" />
+      </div>
+    </div></div>
+    </body></html>
+    """
+
+
+def fake_naver_transport(
+    post_ids: list[str], calls: list[str] | None = None
+) -> httpx.MockTransport:
+    """
+    Serve the Naver endpoints used by the blog service from memory
+
+    :param calls: When given, the path of every request is appended to it
+    """
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if calls is not None:
+            calls.append(request.url.path)
+        if request.url.path.endswith("CategoryList.nhn"):
+            return httpx.Response(200, text=category_list_response())
+        if request.url.path.endswith("PostTitleListAsync.nhn"):
+            count = int(request.url.params["countPerPage"])
+            pages = [post_ids[i : i + count] for i in range(0, len(post_ids), count)]
+            # Like Naver, answer with the last page once past the end
+            page = min(int(request.url.params["currentPage"]), len(pages)) - 1
+            page_ids = pages[page] if pages else []
+            body = json.dumps({"postList": [{"logNo": i} for i in page_ids]})
+            return httpx.Response(200, text=body)
+        if request.url.path.endswith("PostView.nhn"):
+            post_id = request.url.params["logNo"]
+            if post_id not in post_ids:
+                return httpx.Response(404)
+            return httpx.Response(200, text=post_view_html(post_id))
+        return httpx.Response(404)
+
+    return httpx.MockTransport(handler)
@@ -0,0 +1,64 @@
+from collections.abc import Generator, Iterator
+from contextlib import contextmanager
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+@contextmanager
+def capture_selects(engine: Engine) -> Generator[list[tuple[str, Any]], None, None]:
+    """
+    Record the SELECT statements sent to the database, with their parameters
+    """
+    captured: list[tuple[str, Any]] = []
+
+    def before_cursor_execute(
+        _conn: Any,
+        _cursor: Any,
+        statement: str,
+        parameters: Any,
+        _context: Any,
+        executemany: bool,
+    ) -> None:
+        if not executemany and statement.lstrip().upper().startswith("SELECT"):
+            captured.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield captured
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+def _walk(plan: dict[str, Any]) -> Iterator[dict[str, Any]]:
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from _walk(child)
+
+
+def unindexed_scans(engine: Engine, statement: str, parameters: Any) -> list[str]:
+    """
+    Tables a statement reads in full to find its rows
+
+    With ``enable_seqscan`` off the planner picks any usable index however
+    small the table is. What is left is a Seq Scan, or an index scanned end to
+    end with a row Filter because no index matches the condition.
+    """
+    with engine.connect() as connection:
+        connection.exec_driver_sql("SET LOCAL enable_seqscan = off")
+        result = connection.exec_driver_sql(
+            f"EXPLAIN (FORMAT JSON) {statement}", parameters
+        )
+        [[explain]] = result.all()
+        connection.rollback()
+    return [
+        node["Relation Name"]
+        for node in _walk(explain[0]["Plan"])
+        if node["Node Type"] == "Seq Scan"
+        or (
+            node["Node Type"] in ("Index Scan", "Index Only Scan")
+            and "Filter" in node
+            and "Index Cond" not in node
+        )
+    ]
@@ -6,8 +6,12 @@ import { request as __request } from "./core/request"
 import type {
   BlogPostsReadBlogPostData,
   BlogPostsReadBlogPostResponse,
+  BlogPostsReadBlogPostSummariesData,
+  BlogPostsReadBlogPostSummariesResponse,
   BlogPostsReadBlogPostsData,
   BlogPostsReadBlogPostsResponse,
+  BlogPostsSearchBlogPostsData,
+  BlogPostsSearchBlogPostsResponse,
   BlogsCreateBlogData,
   BlogsCreateBlogResponse,
   BlogsDeleteBlogData,
@@ -39,6 +43,7 @@ import type {
   LoginTestTokenResponse,
   PrivateCreateUserData,
   PrivateCreateUserResponse,
+  ProxyImageCacheStatsResponse,
   ProxyProxyImageData,
   ProxyProxyImageResponse,
   UsersCreateUserData,
@@ -62,6 +67,8 @@ import type {
   UtilsHealthCheckResponse,
   UtilsTestEmailData,
   UtilsTestEmailResponse,
+  WinesReadWineMentionsData,
+  WinesReadWineMentionsResponse,
 } from "./types.gen"
 
 export class BlogPostsService {
@@ -72,6 +79,8 @@ export class BlogPostsService {
    * @param data.skip
    * @param data.limit
    * @param data.blogId
+   * @param data.cursor
+   * @param data.countMode
    * @returns BlogPostsPublic Successful Response
    * @throws ApiError
    */
@@ -85,6 +94,74 @@ export class BlogPostsService {
         skip: data.skip,
         limit: data.limit,
         blog_id: data.blogId,
+        cursor: data.cursor,
+        count_mode: data.countMode,
+      },
+      errors: {
+        422: "Validation Error",
+      },
+    })
+  }
+
+  /**
+   * Read Blog Post Summaries
+   * Retrieve the latest blog posts without their content, for listings.
+   *
+   * Only an excerpt of the content and the first images are read, so a page
+   * costs a fraction of ``read_blog_posts``.
+   * @param data The data for the request.
+   * @param data.skip
+   * @param data.limit
+   * @param data.blogId
+   * @param data.cursor
+   * @param data.countMode
+   * @returns BlogPostSummariesPublic Successful Response
+   * @throws ApiError
+   */
+  public static readBlogPostSummaries(
+    data: BlogPostsReadBlogPostSummariesData = {},
+  ): CancelablePromise<BlogPostsReadBlogPostSummariesResponse> {
+    return __request(OpenAPI, {
+      method: "GET",
+      url: "/api/v1/blog/posts/summary",
+      query: {
+        skip: data.skip,
+        limit: data.limit,
+        blog_id: data.blogId,
+        cursor: data.cursor,
+        count_mode: data.countMode,
+      },
+      errors: {
+        422: "Validation Error",
+      },
+    })
+  }
+
+  /**
+   * Search Blog Posts
+   * Search blog posts by title and content, most relevant first.
+   *
+   * Words are matched with full-text search, title matches ranking higher.
+   * With pg_trgm installed, titles that only resemble the query match too, so
+   * misspelled or differently spaced wine names are found. Page with
+   * ``next_cursor`` like the listings.
+   * @param data The data for the request.
+   * @param data.q
+   * @param data.limit
+   * @param data.cursor
+   * @returns BlogPostSearchResults Successful Response
+   * @throws ApiError
+   */
+  public static searchBlogPosts(
+    data: BlogPostsSearchBlogPostsData,
+  ): CancelablePromise<BlogPostsSearchBlogPostsResponse> {
+    return __request(OpenAPI, {
+      method: "GET",
+      url: "/api/v1/blog/posts/search",
+      query: {
+        q: data.q,
+        limit: data.limit,
+        cursor: data.cursor,
       },
       errors: {
         422: "Validation Error",
@@ -123,6 +200,7 @@ export class BlogsService {
    * @param data The data for the request.
    * @param data.skip
    * @param data.limit
+   * @param data.countMode
    * @returns BlogsPublic Successful Response
    * @throws ApiError
    */
@@ -135,6 +213,7 @@ export class BlogsService {
       query: {
         skip: data.skip,
         limit: data.limit,
+        count_mode: data.countMode,
       },
       errors: {
         422: "Validation Error",
@@ -244,6 +323,7 @@ export class ItemsService {
    * @param data The data for the request.
    * @param data.skip
    * @param data.limit
+   * @param data.countMode
    * @returns ItemsPublic Successful Response
    * @throws ApiError
    */
@@ -256,6 +336,7 @@ export class ItemsService {
       query: {
         skip: data.skip,
         limit: data.limit,
+        count_mode: data.countMode,
       },
       errors: {
         422: "Validation Error",
@@ -491,8 +572,20 @@ export class ProxyService {
   /**
    * Proxy Image
    * Proxy image from external sources to bypass CORS restrictions
+   *
+   * ``w``/``h`` resize the image, rounded up to a fixed size bucket, and
+   * ``format`` recompresses it. Resizing defaults to WebP.
+   *
+   * A single byte range is honoured with a 206. Files too large for the cache
+   * are passed through with the range forwarded upstream.
    * @param data The data for the request.
    * @param data.url
+   * @param data.w
+   * @param data.h
+   * @param data.format
+   * @param data.ifNoneMatch
+   * @param data.range
+   * @param data.ifRange
    * @returns unknown Successful Response
    * @throws ApiError
    */
@@ -502,14 +595,35 @@ export class ProxyService {
     return __request(OpenAPI, {
       method: "GET",
       url: "/api/v1/proxy/image",
+      headers: {
+        "if-none-match": data.ifNoneMatch,
+        range: data.range,
+        "if-range": data.ifRange,
+      },
       query: {
         url: data.url,
+        w: data.w,
+        h: data.h,
+        format: data.format,
       },
       errors: {
         422: "Validation Error",
       },
     })
   }
+
+  /**
+   * Image Cache Stats
+   * Hit, miss and eviction counters of the in-memory image tier
+   * @returns CacheStats Successful Response
+   * @throws ApiError
+   */
+  public static imageCacheStats(): CancelablePromise<ProxyImageCacheStatsResponse> {
+    return __request(OpenAPI, {
+      method: "GET",
+      url: "/api/v1/proxy/image/cache-stats",
+    })
+  }
 }
 
 export class UsersService {
@@ -519,6 +633,7 @@ export class UsersService {
    * @param data The data for the request.
    * @param data.skip
    * @param data.limit
+   * @param data.countMode
    * @returns UsersPublic Successful Response
    * @throws ApiError
    */
@@ -531,6 +646,7 @@ export class UsersService {
       query: {
         skip: data.skip,
         limit: data.limit,
+        count_mode: data.countMode,
       },
       errors: {
         422: "Validation Error",
@@ -761,3 +877,35 @@ export class UtilsService {
     })
   }
 }
+
+export class WinesService {
+  /**
+   * Read Wine Mentions
+   * Retrieve the latest posts mentioning a wine, with the vintage and price
+   * quoted for it.
+   *
+   * Any alias in the wine dictionary is accepted for ``wine``.
+   * @param data The data for the request.
+   * @param data.wine
+   * @param data.since
+   * @param data.limit
+   * @returns WineMentionsPublic Successful Response
+   * @throws ApiError
+   */
+  public static readWineMentions(
+    data: WinesReadWineMentionsData,
+  ): CancelablePromise<WinesReadWineMentionsResponse> {
+    return __request(OpenAPI, {
+      method: "GET",
+      url: "/api/v1/wines/mentions",
+      query: {
+        wine: data.wine,
+        since: data.since,
+        limit: data.limit,
+      },
+      errors: {
+        422: "Validation Error",
+      },
+    })
+  }
+}
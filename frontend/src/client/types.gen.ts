@@ -22,6 +22,43 @@ export type BlogPostPublic = {
 export type BlogPostsPublic = {
   data: Array<BlogPostPublic>
   count: number
+  next_cursor?: string | null
+}
+
+export type BlogPostSearchHit = {
+  id: string
+  blog_name: string
+  url: string
+  post_id: string
+  title: string
+  published_at: string
+  excerpt: string
+  image_urls: Array<string>
+  image_count: number
+  rank: number
+}
+
+export type BlogPostSearchResults = {
+  data: Array<BlogPostSearchHit>
+  next_cursor?: string | null
+}
+
+export type BlogPostSummariesPublic = {
+  data: Array<BlogPostSummary>
+  count: number
+  next_cursor?: string | null
+}
+
+export type BlogPostSummary = {
+  id: string
+  blog_name: string
+  url: string
+  post_id: string
+  title: string
+  published_at: string
+  excerpt: string
+  image_urls: Array<string>
+  image_count: number
 }
 
 export type BlogPublic = {
@@ -57,6 +94,14 @@ export type Body_login_login_access_token = {
   client_secret?: string | null
 }
 
+export type CacheStats = {
+  hits: number
+  misses: number
+  evictions: number
+  items: number
+  size: number
+}
+
 export type HTTPValidationError = {
   detail?: Array<ValidationError>
 }
@@ -155,14 +200,51 @@ export type ValidationError = {
   type: string
 }
 
+export type WineMentionPublic = {
+  wine: string
+  vintage?: number | null
+  price?: number | null
+  blog_post_id: string
+  blog_name: string
+  title: string
+  url: string
+  published_at: string
+}
+
+export type WineMentionsPublic = {
+  wine: string
+  data: Array<WineMentionPublic>
+  count: number
+}
+
 export type BlogPostsReadBlogPostsData = {
   blogId?: string | null
+  countMode?: "exact" | "cached" | "estimate"
+  cursor?: string | null
   limit?: number
   skip?: number
 }
 
 export type BlogPostsReadBlogPostsResponse = BlogPostsPublic
 
+export type BlogPostsReadBlogPostSummariesData = {
+  blogId?: string | null
+  countMode?: "exact" | "cached" | "estimate"
+  cursor?: string | null
+  limit?: number
+  skip?: number
+}
+
+export type BlogPostsReadBlogPostSummariesResponse = BlogPostSummariesPublic
+
+export type BlogPostsSearchBlogPostsData = {
+  cursor?: string | null
+  limit?: number
+  q: string
+}
+
+export type BlogPostsSearchBlogPostsResponse = BlogPostSearchResults
+
 export type BlogPostsReadBlogPostData = {
   id: string
 }
@@ -170,6 +252,7 @@ export type BlogPostsReadBlogPostData = {
 export type BlogPostsReadBlogPostResponse = BlogPostPublic
 
 export type BlogsReadBlogsData = {
+  countMode?: "exact" | "cached" | "estimate"
   limit?: number
   skip?: number
 }
@@ -202,6 +285,7 @@ export type BlogsDeleteBlogData = {
 export type BlogsDeleteBlogResponse = Message
 
 export type ItemsReadItemsData = {
+  countMode?: "exact" | "cached" | "estimate"
   limit?: number
   skip?: number
 }
@@ -266,12 +350,21 @@ export type PrivateCreateUserData = {
 export type PrivateCreateUserResponse = UserPublic
 
 export type ProxyProxyImageData = {
+  format?: "webp" | "jpeg" | "png" | null
+  h?: number | null
+  ifNoneMatch?: string | null
+  ifRange?: string | null
+  range?: string | null
   url: string
+  w?: number | null
 }
 
 export type ProxyProxyImageResponse = unknown
 
+export type ProxyImageCacheStatsResponse = CacheStats
+
 export type UsersReadUsersData = {
+  countMode?: "exact" | "cached" | "estimate"
   limit?: number
   skip?: number
 }
@@ -332,3 +425,11 @@ export type UtilsTestEmailData = {
 export type UtilsTestEmailResponse = Message
 
 export type UtilsHealthCheckResponse = boolean
+
+export type WinesReadWineMentionsData = {
+  limit?: number
+  since?: string | null
+  wine: string
+}
+
+export type WinesReadWineMentionsResponse = WineMentionsPublic
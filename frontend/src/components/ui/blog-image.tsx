@@ -1,7 +1,11 @@
-import { OpenAPI } from "@/client"
+import { OpenAPI, type ProxyProxyImageData } from "@/client"
+import { getQueryString } from "@/client/core/request"
 import { Box, Image, Text, VStack } from "@chakra-ui/react"
 import { useEffect, useRef } from "react"
 
+// 타일에 표시할 썸네일 크기 (px), 서버에서 WebP로 리사이즈
+const THUMBNAIL_SIZE = 384
+
 // 이미지 컴포넌트 분리
 interface BlogImageProps {
   imageUrl: string
@@ -33,7 +37,12 @@ function BlogImage({
   }, [])
 
   // 프록시 URL 생성 - OpenAPI.BASE 사용
-  const proxyUrl = `${OpenAPI.BASE}/api/v1/proxy/image?url=${encodeURIComponent(imageUrl)}`
+  const query: ProxyProxyImageData = {
+    url: imageUrl,
+    w: THUMBNAIL_SIZE,
+    h: THUMBNAIL_SIZE,
+  }
+  const proxyUrl = `${OpenAPI.BASE}/api/v1/proxy/image${getQueryString(query)}`
 
   return (
     <Box position="relative" flexShrink={0} w="100%" aspectRatio="1">
@@ -33,6 +33,7 @@ function getBlogPostsQueryOptions({ page }: { page: number }) {
       BlogPostsService.readBlogPosts({
         skip: (page - 1) * PER_PAGE,
         limit: PER_PAGE,
+        countMode: "cached",
       }),
     queryKey: ["blog_posts", { page }],
   }
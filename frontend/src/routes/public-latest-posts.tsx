@@ -19,7 +19,7 @@ export const Route = createFileRoute("/public-latest-posts")({
 
 function getLatestPostsQueryOptions() {
   return {
-    queryFn: () => BlogPostsService.readBlogPosts({ limit: 100 }),
+    queryFn: () => BlogPostsService.readBlogPostSummaries({ limit: 100 }),
     queryKey: ["latest_posts"],
     staleTime: 5 * 60 * 1000, // 5분간 캐시
   }
@@ -142,9 +142,7 @@ function PublicLatestPosts() {
             <div>
               <VStack align="start" gap={4}>
                 <Heading size="md">{latestPost.title}</Heading>
-                <Text color="gray.600">
-                  {latestPost.content.substring(0, 200)}...
-                </Text>
+                <Text color="gray.600">{latestPost.excerpt}</Text>
                 {latestPost.image_urls && latestPost.image_urls.length > 0 && (
                   <Grid
                     templateColumns={{